@@ -1,20 +1,11 @@
-from http.server import BaseHTTPRequestHandler
-import json
+"""
+Vercel entrypoint for /api/ai - served by the shared Flask app
+"""
 
-class handler(BaseHTTPRequestHandler):
-    def do_POST(self):
-        content_length = int(self.headers.get('Content-Length', 0))
-        body = self.rfile.read(content_length)
-        try:
-            data = json.loads(body)
-            query = data.get('query', '')
-            # Dummy: just echo the query for now
-            output = f'AI mode received: {query}'
-            response = {'output': output}
-        except Exception as e:
-            response = {'error': str(e)}
+import os
+import sys
 
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps(response).encode())
\ No newline at end of file
+# Make the project root importable from the api/ directory
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import app
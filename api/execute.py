@@ -0,0 +1,11 @@
+"""
+Vercel entrypoint for /api/execute - served by the shared Flask app
+"""
+
+import os
+import sys
+
+# Make the project root importable from the api/ directory
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import app
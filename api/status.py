@@ -1,11 +1,11 @@
-from http.server import BaseHTTPRequestHandler
-import json
+"""
+Vercel entrypoint for /api/status - served by the shared Flask app
+"""
 
-class handler(BaseHTTPRequestHandler):
-    def do_GET(self):
-        # Dummy: always show home directory
-        response = {'current_dir': '~'}
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps(response).encode())
\ No newline at end of file
+import os
+import sys
+
+# Make the project root importable from the api/ directory
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import app
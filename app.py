@@ -4,13 +4,31 @@ Flask Web Interface for Python Terminal - Vercel Deployment
 """
 
 from flask import Flask, render_template, request, jsonify, session
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 import os
+import re
+import hashlib
 import sys
-import uuid
+import secrets
 import json
+import time
+from collections import OrderedDict
+from functools import wraps
 from datetime import datetime
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
 # Add the current directory to Python path
 sys.path.insert(0, os.path.dirname(__file__))
 
@@ -22,132 +40,257 @@ app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'your-secret-key-change-in-production')
 CORS(app)
 
-# Store terminal sessions (in production, use Redis or database)
-terminal_sessions = {}
+class OrjsonProvider(JSONProvider):
+    """JSON provider that serializes responses with orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype='application/json')
+
+# Use orjson for jsonify/get_json when available, otherwise keep Flask's default
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
+
+class SessionCache:
+    """Dict-like LRU cache whose entries also expire after an idle timeout"""
+    
+    def __init__(self, maxsize=1024, ttl=1800):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._items = OrderedDict()
+    
+    def _expire(self):
+        """Drop entries that have been idle longer than the TTL"""
+        cutoff = time.monotonic() - self.ttl
+        while self._items:
+            oldest_key = next(iter(self._items))
+            if self._items[oldest_key][0] > cutoff:
+                break
+            del self._items[oldest_key]
+    
+    def __contains__(self, key):
+        self._expire()
+        return key in self._items
+    
+    def __getitem__(self, key):
+        self._expire()
+        value = self._items[key][1]
+        # Refresh recency and idle timer
+        self._items[key] = (time.monotonic(), value)
+        self._items.move_to_end(key)
+        return value
+    
+    def __setitem__(self, key, value):
+        self._expire()
+        self._items[key] = (time.monotonic(), value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+    
+    def __delitem__(self, key):
+        del self._items[key]
+    
+    def __len__(self):
+        return len(self._items)
+
+class SessionEntry:
+    """A local terminal and the shared state it was last synced with"""
+    
+    __slots__ = ('terminal', 'generation', 'fs_version')
+    
+    def __init__(self, terminal):
+        self.terminal = terminal
+        # Redis generation of the state this terminal holds, and the
+        # filesystem version at which it was last loaded or saved
+        self.generation = None
+        self.fs_version = terminal.virtual_fs.version
+
+# Store terminal sessions locally (bounded, idle sessions expire);
+# session state is shared through Redis when configured
+terminal_sessions = SessionCache(maxsize=1024, ttl=1800)
+
+# Seconds an idle session state is kept in Redis
+SESSION_TTL = 600
+
+redis_client = None
+if REDIS_AVAILABLE and os.environ.get('REDIS_URL'):
+    redis_client = redis.Redis.from_url(os.environ['REDIS_URL'])
+
+# Precompiled pattern for ANSI escape sequences
+_ANSI_RE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
+# HTML replacements applied to terminal output for web display
+_WEB_FORMAT_MAP = {
+    '\n': '<br>',
+    'Error:': '<span class="error">Error:</span>',
+    '✅': '<span class="success">✅</span>',
+    '❌': '<span class="error">❌</span>',
+    '⚠️': '<span class="warning">⚠️</span>',
+}
+_WEB_FORMAT_RE = re.compile('|'.join(re.escape(key) for key in _WEB_FORMAT_MAP))
+
+def _web_format_replace(match):
+    """Return the HTML replacement for a matched marker"""
+    return _WEB_FORMAT_MAP[match.group(0)]
+
+def _session_key(session_id):
+    """Redis key holding the state of a terminal session"""
+    return f"term:{session_id}"
+
+def _generation_key(session_id):
+    """Redis key counting the saves of a terminal session's state"""
+    return f"term:{session_id}:gen"
 
 def get_terminal_session(session_id):
     """Get or create a terminal session"""
     if session_id not in terminal_sessions:
         # Create new terminal with virtual filesystem for web safety
-        terminal_sessions[session_id] = Terminal(use_virtual=True)
-    return terminal_sessions[session_id]
+        terminal_sessions[session_id] = SessionEntry(Terminal(use_virtual=True))
+    entry = terminal_sessions[session_id]
+    terminal = entry.terminal
+    
+    # Another worker may have handled this session last; pull the shared state
+    # only when it has been saved since this worker last synced
+    if redis_client is not None:
+        key = _session_key(session_id)
+        generation_key = _generation_key(session_id)
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.get(generation_key)
+        # Reading the session keeps it alive even when nothing is saved
+        pipe.expire(key, SESSION_TTL)
+        pipe.expire(generation_key, SESSION_TTL)
+        generation = pipe.execute()[0]
+        
+        if generation is not None and int(generation) != entry.generation:
+            blob = redis_client.get(key)
+            if blob is not None:
+                state = json.loads(blob)
+                terminal.virtual_fs.load_state(state['fs'])
+                terminal.command_history.clear()
+                terminal.command_history.extend(state['history'])
+                entry.generation = int(generation)
+                entry.fs_version = terminal.virtual_fs.version
+    
+    return terminal
+
+def save_terminal_session(session_id, terminal):
+    """Persist terminal session state to Redis if the command changed the filesystem or cwd"""
+    if redis_client is None or session_id not in terminal_sessions:
+        return
+    entry = terminal_sessions[session_id]
+    if terminal.virtual_fs.version == entry.fs_version:
+        return
+    
+    state = {
+        'fs': terminal.virtual_fs.export_state(),
+        'history': list(terminal.command_history)
+    }
+    # Bump the generation in the same transaction as the write
+    pipe = redis_client.pipeline()
+    pipe.incr(_generation_key(session_id))
+    pipe.expire(_generation_key(session_id), SESSION_TTL)
+    pipe.setex(_session_key(session_id), SESSION_TTL, json.dumps(state))
+    entry.generation = pipe.execute()[0]
+    entry.fs_version = terminal.virtual_fs.version
 
 def strip_ansi_codes(text):
     """Remove ANSI color codes from text for web display"""
-    import re
-    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-    return ansi_escape.sub('', text)
+    # Plain output has no escape sequences; skip the regex scan entirely
+    if '\x1b' not in text:
+        return text
+    return _ANSI_RE.sub('', text)
 
 def format_for_web(text):
     """Format terminal output for web display"""
     if not text:
         return ""
     
-    # Strip ANSI codes and convert to HTML
+    # Strip ANSI codes, then convert newlines and styled markers to HTML in one pass
     clean_text = strip_ansi_codes(text)
-    
-    # Convert newlines to HTML breaks
-    html_text = clean_text.replace('\n', '<br>')
-    
-    # Add basic styling classes (you can enhance this)
-    html_text = html_text.replace('Error:', '<span class="error">Error:</span>')
-    html_text = html_text.replace('✅', '<span class="success">✅</span>')
-    html_text = html_text.replace('❌', '<span class="error">❌</span>')
-    html_text = html_text.replace('⚠️', '<span class="warning">⚠️</span>')
-    
-    return html_text
+    return _WEB_FORMAT_RE.sub(_web_format_replace, clean_text)
 
 @app.route('/')
 def index():
     """Main terminal interface"""
     return render_template('terminal.html')
 
+def with_terminal(view):
+    """Resolve the caller's terminal session and report errors as JSON"""
+    @wraps(view)
+    def wrapper():
+        try:
+            session_id = session.get('session_id')
+            if session_id is None:
+                session_id = session['session_id'] = secrets.token_hex(16)
+            return view(session_id, get_terminal_session(session_id))
+        except Exception as e:
+            return jsonify({'error': f'Server error: {str(e)}'})
+    return wrapper
+
 @app.route('/api/execute', methods=['POST'])
-def execute_command():
+@with_terminal
+def execute_command(session_id, terminal):
     """Execute a command and return result"""
-    try:
-        data = request.get_json()
-        command = data.get('command', '').strip()
-        
-        if not command:
-            return jsonify({'error': 'No command provided'})
-        
-        # Get or create session
-        if 'session_id' not in session:
-            session['session_id'] = str(uuid.uuid4())
-        
-        terminal = get_terminal_session(session['session_id'])
-        
-        # Execute command
-        output = terminal.execute(command)
-        
-        # Format output for web
-        formatted_output = format_for_web(output)
-        
-        # Get current directory
-        current_dir = terminal.get_current_directory()
-        
-        return jsonify({
-            'output': formatted_output,
-            'current_dir': current_dir,
-            'timestamp': datetime.now().isoformat()
-        })
-        
-    except Exception as e:
-        return jsonify({'error': f'Server error: {str(e)}'})
+    data = request.get_json()
+    command = data.get('command', '').strip()
+    
+    if not command:
+        return jsonify({'error': 'No command provided'})
+    
+    # Execute command
+    output = terminal.execute(command)
+    save_terminal_session(session_id, terminal)
+    
+    return jsonify({
+        'output': format_for_web(output),
+        'current_dir': terminal.get_current_directory()
+    })
 
 @app.route('/api/ai', methods=['POST'])
-def ai_command():
+@with_terminal
+def ai_command(session_id, terminal):
     """Execute AI natural language command"""
-    try:
-        data = request.get_json()
-        query = data.get('query', '').strip()
-        
-        if not query:
-            return jsonify({'error': 'No query provided'})
-        
-        # Get or create session
-        if 'session_id' not in session:
-            session['session_id'] = str(uuid.uuid4())
-        
-        terminal = get_terminal_session(session['session_id'])
-        
-        # Execute AI command
-        output = terminal.execute(f"ai {query}")
-        
-        # Format output for web
-        formatted_output = format_for_web(output)
-        
-        # Get current directory
-        current_dir = terminal.get_current_directory()
-        
-        return jsonify({
-            'output': formatted_output,
-            'current_dir': current_dir,
-            'timestamp': datetime.now().isoformat()
-        })
-        
-    except Exception as e:
-        return jsonify({'error': f'Server error: {str(e)}'})
+    data = request.get_json()
+    query = data.get('query', '').strip()
+    
+    if not query:
+        return jsonify({'error': 'No query provided'})
+    
+    # Execute AI command directly rather than re-parsing "ai <query>"
+    terminal.command_history.append(f"ai {query}")
+    output = terminal.ai_commands.cmd_ai([query])
+    save_terminal_session(session_id, terminal)
+    
+    return jsonify({
+        'output': format_for_web(output),
+        'current_dir': terminal.get_current_directory()
+    })
 
 @app.route('/api/status')
-def status():
+@with_terminal
+def status(session_id, terminal):
     """Get terminal status"""
-    try:
-        if 'session_id' not in session:
-            session['session_id'] = str(uuid.uuid4())
-        
-        terminal = get_terminal_session(session['session_id'])
-        current_dir = terminal.get_current_directory()
-        
-        return jsonify({
+    current_dir = terminal.get_current_directory()
+    
+    # Status only changes with the session or directory; let polling clients revalidate
+    etag = hashlib.blake2b(f"{session_id}:{current_dir}".encode(), digest_size=8).hexdigest()
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+    else:
+        response = jsonify({
             'current_dir': current_dir,
-            'session_id': session['session_id'],
+            'session_id': session_id,
             'status': 'ready'
         })
-        
-    except Exception as e:
-        return jsonify({'error': f'Server error: {str(e)}'})
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 @app.route('/api/clear')
 def clear_session():
@@ -157,7 +300,9 @@ def clear_session():
             session_id = session['session_id']
             if session_id in terminal_sessions:
                 del terminal_sessions[session_id]
-            session['session_id'] = str(uuid.uuid4())
+            if redis_client is not None:
+                redis_client.delete(_session_key(session_id), _generation_key(session_id))
+            session['session_id'] = secrets.token_hex(16)
         
         return jsonify({'message': 'Session cleared'})
         
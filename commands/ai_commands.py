@@ -3,310 +3,429 @@ AI Commands - Natural language command interpretation
 """
 
 import re
+import functools
+import itertools
+from textwrap import indent
 from typing import List, Tuple, Dict, Any
 from utils.colors import Colors
 
+def _every_line(line: str) -> bool:
+    """Predicate for textwrap.indent that also indents blank lines"""
+    return True
+
+# Usage text shown by a bare `ai` command
+_AI_HELP = f"""{Colors.CYAN}AI Assistant - Natural Language Commands{Colors.RESET}
+
+{Colors.YELLOW}Examples:{Colors.RESET}
+  ai create folder called projects
+  ai show me what files are here  
+  ai copy readme.txt to backup folder
+  ai go to documents directory
+  ai find files with .py extension
+  ai show system information
+  ai delete file olddata.txt
+
+{Colors.YELLOW}Supported operations:{Colors.RESET}
+  • File/folder creation, deletion, copying, moving
+  • Directory navigation and listing
+  • File searching and content viewing
+  • System information and process monitoring
+  • Memory and disk usage checking
+
+{Colors.GREEN}Try: ai <your command in plain English>{Colors.RESET}
+            """
+
+# Regex patterns per command type; earlier entries win when several match
+_COMMAND_PATTERNS = {
+    'create_dir': [
+        r'(?:create|make).*?(?:folder|directory).*?(?:called|named)?\s+(["\']?)(\w+)\1',
+        r'mkdir\s+(["\']?)(\w+)\1',
+        r'new\s+(?:folder|directory)\s+(["\']?)(\w+)\1',
+    ],
+    'create_file': [
+        r'(?:create|make).*?file.*?(?:called|named)?\s+(["\']?)([^"\'\s]+)\1',
+        r'touch\s+(["\']?)([^"\'\s]+)\1',
+        r'new\s+file\s+(["\']?)([^"\'\s]+)\1',
+    ],
+    'list': [
+        r'(?:list|show).*?(?:files|directories|contents|what\'?s here)',
+        r'what.*?(?:here|directory|folder)',
+        r'ls',
+        r'dir',
+        r'show\s+me.*?(?:files|contents)'
+    ],
+    'list_detailed': [
+        r'(?:list|show).*?(?:detailed|details|long)',
+        r'ls.*?-l',
+        r'detailed.*?(?:list|listing)'
+    ],
+    'change_dir': [
+        r'(?:go|navigate|change).*?(?:to|into)\s+(["\']?)([^"\'\s]+)\1',
+        r'cd\s+(["\']?)([^"\'\s]+)\1',
+        r'enter\s+(?:folder|directory)\s+(["\']?)([^"\'\s]+)\1',
+    ],
+    'go_home': [
+        r'go\s+home',
+        r'cd\s+~',
+        r'home\s+directory'
+    ],
+    'go_back': [
+        r'go\s+back',
+        r'cd\s+\.\.',
+        r'parent\s+directory',
+        r'up\s+(?:one\s+)?(?:level|directory)'
+    ],
+    'current_dir': [
+        r'where.*?am.*?i',
+        r'current.*?(?:directory|folder|location|path)',
+        r'pwd',
+        r'print.*?working.*?directory'
+    ],
+    'remove_file': [
+        r'(?:delete|remove).*?file\s+(["\']?)([^"\'\s]+)\1',
+        r'rm\s+(["\']?)([^"\'\s]+)\1',
+    ],
+    'remove_dir': [
+        r'(?:delete|remove).*?(?:folder|directory)\s+(["\']?)([^"\'\s]+)\1',
+        r'rmdir\s+(["\']?)([^"\'\s]+)\1',
+        r'rm\s+-r\s+(["\']?)([^"\'\s]+)\1',
+    ],
+    'copy': [
+        r'copy\s+(["\']?)([^"\'\s]+)\1.*?(?:to|into)\s+(["\']?)([^"\'\s]+)\3',
+        r'cp\s+(["\']?)([^"\'\s]+)\1\s+(["\']?)([^"\'\s]+)\3',
+    ],
+    'move': [
+        r'move\s+(["\']?)([^"\'\s]+)\1.*?(?:to|into)\s+(["\']?)([^"\'\s]+)\3',
+        r'mv\s+(["\']?)([^"\'\s]+)\1\s+(["\']?)([^"\'\s]+)\3',
+        r'rename\s+(["\']?)([^"\'\s]+)\1.*?(?:to)\s+(["\']?)([^"\'\s]+)\3',
+    ],
+    'show_file': [
+        r'(?:show|display|cat|read).*?file\s+(["\']?)([^"\'\s]+)\1',
+        r'cat\s+(["\']?)([^"\'\s]+)\1',
+        r'what\'?s\s+in\s+(["\']?)([^"\'\s]+)\1',
+    ],
+    'find_file': [
+        r'find.*?file.*?(?:called|named)\s+(["\']?)([^"\'\s]+)\1',
+        r'search.*?for.*?(["\']?)([^"\'\s]+)\1',
+        r'locate.*?(["\']?)([^"\'\s]+)\1',
+    ],
+    'system_info': [
+        r'(?:show|display).*?system.*?(?:info|information)',
+        r'sysinfo',
+        r'system\s+details',
+        r'computer\s+info'
+    ],
+    'processes': [
+        r'(?:show|list).*?(?:processes|running\s+programs)',
+        r'ps',
+        r'what.*?running',
+        r'active\s+processes'
+    ],
+    'memory': [
+        r'(?:show|check).*?memory.*?usage',
+        r'free\s+memory',
+        r'ram\s+usage',
+        r'memory\s+info'
+    ],
+    'disk_space': [
+        r'(?:show|check).*?disk.*?(?:space|usage)',
+        r'df',
+        r'storage\s+info',
+        r'free\s+space'
+    ],
+    'clear_screen': [
+        r'clear.*?(?:screen|terminal)',
+        r'cls',
+        r'clean.*?screen'
+    ],
+    'help': [
+        r'help',
+        r'what.*?can.*?do',
+        r'available.*?commands',
+        r'show.*?commands'
+    ]
+}
+
+# Common file/directory shortcuts
+_SHORTCUTS = {
+    'desktop': 'Desktop',
+    'documents': 'Documents', 
+    'downloads': 'Downloads',
+    'home': '~',
+    'root': '/',
+    'temp': '/tmp',
+    'temporary': '/tmp'
+}
+
+# Example queries suggested when a keyword appears in an unrecognized query
+_SUGGESTION_MAP = {
+    'create': ['create folder myproject', 'create file readme.txt'],
+    'make': ['make directory docs', 'make file script.py'],
+    'list': ['list files', 'show directory contents'],
+    'show': ['show files', 'show system info', 'show processes'],
+    'copy': ['copy file1.txt to backup/', 'copy folder1 to archive/'],
+    'move': ['move file.txt to documents/', 'rename old.txt to new.txt'],
+    'delete': ['delete file unwanted.txt', 'remove folder oldstuff'],
+    'find': ['find file *.py', 'search for readme'],
+    'go': ['go to documents', 'go home', 'go back'],
+}
+_SUGGESTION_PATTERN = re.compile(
+    '(?=(' + '|'.join(re.escape(keyword) for keyword in _SUGGESTION_MAP) + '))'
+)
+
+# Literals of which every pattern (and the create/make fallback)
+# requires at least one; keep in sync with _COMMAND_PATTERNS
+_KEYWORDS = frozenset({
+    'create', 'make', 'new', 'touch', 'list', 'show', 'what', 'ls',
+    'dir', 'detailed', 'go', 'navigate', 'change', 'cd', 'enter',
+    'home', 'parent', 'up', 'where', 'current', 'pwd', 'print',
+    'delete', 'remove', 'rm', 'copy', 'cp', 'move', 'mv', 'rename',
+    'display', 'cat', 'read', 'find', 'search', 'locate', 'system',
+    'sysinfo', 'computer', 'ps', 'active', 'check', 'free', 'ram',
+    'memory', 'storage', 'df', 'clear', 'cls', 'clean', 'help',
+    'available',
+})
+
+# Ordered (command_type, compiled pattern) pairs, used as a fallback
+_PATTERN_SEQUENCE = [
+    (command_type, re.compile(pattern, re.IGNORECASE))
+    for command_type, patterns in _COMMAND_PATTERNS.items()
+    for pattern in patterns
+]
+
+def _namespace_groups(pattern: str, prefix: str) -> Tuple[str, List[str]]:
+    """
+    Rename capturing groups and numeric backreferences in a pattern
+    
+    Args:
+        pattern: Regex pattern using plain groups and \\N backreferences
+        prefix: Unique prefix for the generated group names
+    
+    Returns:
+        Tuple of (rewritten_pattern, group_names_in_order)
+    """
+    out = []
+    group_names = []
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            escaped = pattern[i + 1] if i + 1 < len(pattern) else ''
+            if not in_class and escaped.isdigit():
+                out.append(f"(?P={prefix}_{escaped})")
+            else:
+                out.append(char + escaped)
+            i += 2
+            continue
+        if in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+        elif char == '(' and not pattern.startswith('?', i + 1):
+            group_names.append(f"{prefix}_{len(group_names) + 1}")
+            out.append(f"(?P<{group_names[-1]}>")
+            i += 1
+            continue
+        out.append(char)
+        i += 1
+    return ''.join(out), group_names
+
+def _fuse_patterns() -> Tuple[Any, Dict[str, Tuple[int, str, List[str]]]]:
+    """
+    Fuse all patterns into one anchored alternation so a single search
+    classifies the query
+    
+    Alternatives are tried in declaration order, and the lazy '[\\s\\S]*?'
+    prefix lets each one start anywhere in the query (across newlines, like
+    search), preserving the first-pattern-wins priority of the sequential
+    loop. No DOTALL: the patterns' own '.' must keep stopping at newlines.
+    
+    Returns:
+        Tuple of (combined_pattern, {wrapper_group: (index, command_type, group_names)})
+    """
+    alternatives = []
+    alternative_info = {}
+    for index, (command_type, pattern) in enumerate(_PATTERN_SEQUENCE):
+        wrapper = f"p{index}"
+        body, group_names = _namespace_groups(pattern.pattern, wrapper)
+        alternatives.append(f"[\\s\\S]*?(?P<{wrapper}>{body})")
+        alternative_info[wrapper] = (index, command_type, group_names)
+    combined = re.compile('^(?:' + '|'.join(alternatives) + ')', re.IGNORECASE)
+    return combined, alternative_info
+
+_COMBINED_PATTERN, _ALTERNATIVE_INFO = _fuse_patterns()
+
+def _normalize_shortcut(path: str) -> str:
+    """Normalize path using shortcuts"""
+    return _SHORTCUTS.get(path.lower(), path)
+
+def _name_from_groups(groups: Tuple, default: str) -> str:
+    """Extract a name from (quote, name) groups, handling quoted and unquoted forms"""
+    if len(groups) >= 2:
+        return groups[1] or groups[0]  # Take non-empty group
+    return groups[0] if groups else default
+
+def _fixed_handler(cmd: str, *args: str):
+    """Build a handler that always returns the same command"""
+    return lambda groups: (cmd, list(args))
+
+def _h_create_dir(groups: Tuple) -> Tuple[str, List[str]]:
+    """Handle create_dir matches"""
+    return 'mkdir', [_normalize_shortcut(_name_from_groups(groups, 'newfolder'))]
+
+def _h_create_file(groups: Tuple) -> Tuple[str, List[str]]:
+    """Handle create_file matches"""
+    return 'touch', [_name_from_groups(groups, 'newfile.txt')]
+
+def _h_change_dir(groups: Tuple) -> Tuple[str, List[str]]:
+    """Handle change_dir matches"""
+    return 'cd', [_normalize_shortcut(_name_from_groups(groups, '.'))]
+
+def _h_remove_file(groups: Tuple) -> Tuple[str, List[str]]:
+    """Handle remove_file matches"""
+    file_name = _name_from_groups(groups, '')
+    return ('rm', [file_name]) if file_name else ('rm', [])
+
+def _h_remove_dir(groups: Tuple) -> Tuple[str, List[str]]:
+    """Handle remove_dir matches"""
+    dir_name = _name_from_groups(groups, '')
+    return ('rm', ['-r', dir_name]) if dir_name else ('rm', ['-r'])
+
+def _h_copy(groups: Tuple) -> Tuple[str, List[str]]:
+    """Handle copy matches"""
+    if len(groups) >= 4:
+        return 'cp', [groups[1] or groups[0], groups[3] or groups[2]]
+    return None, []
+
+def _h_move(groups: Tuple) -> Tuple[str, List[str]]:
+    """Handle move matches"""
+    if len(groups) >= 4:
+        return 'mv', [groups[1] or groups[0], groups[3] or groups[2]]
+    return None, []
+
+def _h_show_file(groups: Tuple) -> Tuple[str, List[str]]:
+    """Handle show_file matches"""
+    file_name = _name_from_groups(groups, '')
+    return ('cat', [file_name]) if file_name else ('cat', [])
+
+def _h_find_file(groups: Tuple) -> Tuple[str, List[str]]:
+    """Handle find_file matches"""
+    return 'find', [_name_from_groups(groups, '*')]
+
+# Match handlers by command type; fixed commands ignore the groups
+_HANDLERS = {
+    'create_dir': _h_create_dir,
+    'create_file': _h_create_file,
+    'list': _fixed_handler('ls'),
+    'list_detailed': _fixed_handler('ls', '-l'),
+    'change_dir': _h_change_dir,
+    'go_home': _fixed_handler('cd', '~'),
+    'go_back': _fixed_handler('cd', '..'),
+    'current_dir': _fixed_handler('pwd'),
+    'remove_file': _h_remove_file,
+    'remove_dir': _h_remove_dir,
+    'copy': _h_copy,
+    'move': _h_move,
+    'show_file': _h_show_file,
+    'find_file': _h_find_file,
+    'system_info': _fixed_handler('sysinfo'),
+    'processes': _fixed_handler('ps'),
+    'memory': _fixed_handler('free'),
+    'disk_space': _fixed_handler('df'),
+    'clear_screen': _fixed_handler('clear'),
+    'help': _fixed_handler('help'),
+}
+
+def _process_match(command_type: str, groups: Tuple) -> Tuple[str, List[str]]:
+    """Process regex match groups and return command and arguments"""
+    handler = _HANDLERS.get(command_type)
+    if handler is None:
+        return None, []
+    return handler(groups)
+
+def _interpret(query: str) -> List[Tuple[str, List[str]]]:
+    """Match a stripped query against the command patterns"""
+    if not query:
+        return []
+    
+    commands = []
+    
+    # Nothing can match without one of the keywords; skip the regex work
+    query_folded = query.casefold()
+    if not any(keyword in query_folded for keyword in _KEYWORDS):
+        return commands
+    
+    # Classify the query with a single search over all patterns
+    match = _COMBINED_PATTERN.search(query)
+    if match:
+        index, command_type, group_names = _ALTERNATIVE_INFO[match.lastgroup]
+        groups = tuple(match.group(name) for name in group_names)
+        cmd, args = _process_match(command_type, groups)
+        if cmd:
+            commands.append((cmd, args))
+            return commands
+        
+        # Handler rejected the match; continue with the remaining patterns
+        for command_type, pattern in _PATTERN_SEQUENCE[index + 1:]:
+            match = pattern.search(query)
+            if match:
+                cmd, args = _process_match(command_type, match.groups())
+                if cmd:
+                    commands.append((cmd, args))
+                    return commands  # Return first match
+    
+    # If no patterns matched, try to extract basic commands
+    words = query.lower().split()
+    if 'create' in words or 'make' in words:
+        if 'folder' in words or 'directory' in words:
+            # Try to extract folder name
+            for word in words:
+                if word not in ['create', 'make', 'a', 'folder', 'directory', 'called', 'named']:
+                    commands.append(('mkdir', [word]))
+                    break
+        elif 'file' in words:
+            # Try to extract file name
+            for word in words:
+                if word not in ['create', 'make', 'a', 'file', 'called', 'named']:
+                    commands.append(('touch', [word]))
+                    break
+    
+    return commands
+
+# Interpretation is a pure function of the query; share the cache across
+# every interpreter (the web app builds one per session)
+@functools.lru_cache(maxsize=2048)
+def _interpret_cached(query: str) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    """Interpret a stripped query, returning immutable results for caching"""
+    return tuple((cmd, tuple(args)) for cmd, args in _interpret(query))
+
 class AICommandInterpreter:
     """Interprets natural language commands into terminal commands"""
     
     def __init__(self):
-        self.command_patterns = {
-            'create_dir': [
-                r'(?:create|make).*?(?:folder|directory).*?(?:called|named)?\s+(["\']?)(\w+)\1',
-                r'mkdir\s+(["\']?)(\w+)\1',
-                r'new\s+(?:folder|directory)\s+(["\']?)(\w+)\1',
-            ],
-            'create_file': [
-                r'(?:create|make).*?file.*?(?:called|named)?\s+(["\']?)([^"\'\s]+)\1',
-                r'touch\s+(["\']?)([^"\'\s]+)\1',
-                r'new\s+file\s+(["\']?)([^"\'\s]+)\1',
-            ],
-            'list': [
-                r'(?:list|show).*?(?:files|directories|contents|what\'?s here)',
-                r'what.*?(?:here|directory|folder)',
-                r'ls',
-                r'dir',
-                r'show\s+me.*?(?:files|contents)'
-            ],
-            'list_detailed': [
-                r'(?:list|show).*?(?:detailed|details|long)',
-                r'ls.*?-l',
-                r'detailed.*?(?:list|listing)'
-            ],
-            'change_dir': [
-                r'(?:go|navigate|change).*?(?:to|into)\s+(["\']?)([^"\'\s]+)\1',
-                r'cd\s+(["\']?)([^"\'\s]+)\1',
-                r'enter\s+(?:folder|directory)\s+(["\']?)([^"\'\s]+)\1',
-            ],
-            'go_home': [
-                r'go\s+home',
-                r'cd\s+~',
-                r'home\s+directory'
-            ],
-            'go_back': [
-                r'go\s+back',
-                r'cd\s+\.\.',
-                r'parent\s+directory',
-                r'up\s+(?:one\s+)?(?:level|directory)'
-            ],
-            'current_dir': [
-                r'where.*?am.*?i',
-                r'current.*?(?:directory|folder|location|path)',
-                r'pwd',
-                r'print.*?working.*?directory'
-            ],
-            'remove_file': [
-                r'(?:delete|remove).*?file\s+(["\']?)([^"\'\s]+)\1',
-                r'rm\s+(["\']?)([^"\'\s]+)\1',
-            ],
-            'remove_dir': [
-                r'(?:delete|remove).*?(?:folder|directory)\s+(["\']?)([^"\'\s]+)\1',
-                r'rmdir\s+(["\']?)([^"\'\s]+)\1',
-                r'rm\s+-r\s+(["\']?)([^"\'\s]+)\1',
-            ],
-            'copy': [
-                r'copy\s+(["\']?)([^"\'\s]+)\1.*?(?:to|into)\s+(["\']?)([^"\'\s]+)\3',
-                r'cp\s+(["\']?)([^"\'\s]+)\1\s+(["\']?)([^"\'\s]+)\3',
-            ],
-            'move': [
-                r'move\s+(["\']?)([^"\'\s]+)\1.*?(?:to|into)\s+(["\']?)([^"\'\s]+)\3',
-                r'mv\s+(["\']?)([^"\'\s]+)\1\s+(["\']?)([^"\'\s]+)\3',
-                r'rename\s+(["\']?)([^"\'\s]+)\1.*?(?:to)\s+(["\']?)([^"\'\s]+)\3',
-            ],
-            'show_file': [
-                r'(?:show|display|cat|read).*?file\s+(["\']?)([^"\'\s]+)\1',
-                r'cat\s+(["\']?)([^"\'\s]+)\1',
-                r'what\'?s\s+in\s+(["\']?)([^"\'\s]+)\1',
-            ],
-            'find_file': [
-                r'find.*?file.*?(?:called|named)\s+(["\']?)([^"\'\s]+)\1',
-                r'search.*?for.*?(["\']?)([^"\'\s]+)\1',
-                r'locate.*?(["\']?)([^"\'\s]+)\1',
-            ],
-            'system_info': [
-                r'(?:show|display).*?system.*?(?:info|information)',
-                r'sysinfo',
-                r'system\s+details',
-                r'computer\s+info'
-            ],
-            'processes': [
-                r'(?:show|list).*?(?:processes|running\s+programs)',
-                r'ps',
-                r'what.*?running',
-                r'active\s+processes'
-            ],
-            'memory': [
-                r'(?:show|check).*?memory.*?usage',
-                r'free\s+memory',
-                r'ram\s+usage',
-                r'memory\s+info'
-            ],
-            'disk_space': [
-                r'(?:show|check).*?disk.*?(?:space|usage)',
-                r'df',
-                r'storage\s+info',
-                r'free\s+space'
-            ],
-            'clear_screen': [
-                r'clear.*?(?:screen|terminal)',
-                r'cls',
-                r'clean.*?screen'
-            ],
-            'help': [
-                r'help',
-                r'what.*?can.*?do',
-                r'available.*?commands',
-                r'show.*?commands'
-            ]
-        }
-        
-        # Common file/directory shortcuts
-        self.shortcuts = {
-            'desktop': 'Desktop',
-            'documents': 'Documents', 
-            'downloads': 'Downloads',
-            'home': '~',
-            'root': '/',
-            'temp': '/tmp',
-            'temporary': '/tmp'
-        }
+        # Pattern tables and compiled matchers are module-level and shared
+        self.command_patterns = _COMMAND_PATTERNS
+        self.shortcuts = _SHORTCUTS
+        self.suggestion_map = _SUGGESTION_MAP
     
     def normalize_path(self, path: str) -> str:
         """Normalize path using shortcuts"""
-        path_lower = path.lower()
-        if path_lower in self.shortcuts:
-            return self.shortcuts[path_lower]
-        return path
+        return _normalize_shortcut(path)
     
     def interpret(self, query: str) -> List[Tuple[str, List[str]]]:
         """Interpret natural language query into commands"""
-        query = query.strip()
-        if not query:
-            return []
-        
-        commands = []
-        
-        # Check each command pattern
-        for command_type, patterns in self.command_patterns.items():
-            for pattern in patterns:
-                match = re.search(pattern, query, re.IGNORECASE)
-                if match:
-                    cmd, args = self._process_match(command_type, match, query)
-                    if cmd:
-                        commands.append((cmd, args))
-                        return commands  # Return first match
-        
-        # If no patterns matched, try to extract basic commands
-        words = query.lower().split()
-        if 'create' in words or 'make' in words:
-            if 'folder' in words or 'directory' in words:
-                # Try to extract folder name
-                for word in words:
-                    if word not in ['create', 'make', 'a', 'folder', 'directory', 'called', 'named']:
-                        commands.append(('mkdir', [word]))
-                        break
-            elif 'file' in words:
-                # Try to extract file name
-                for word in words:
-                    if word not in ['create', 'make', 'a', 'file', 'called', 'named']:
-                        commands.append(('touch', [word]))
-                        break
-        
-        return commands
-    
-    def _process_match(self, command_type: str, match: re.Match, query: str) -> Tuple[str, List[str]]:
-        """Process regex match and return command and arguments"""
-        
-        if command_type == 'create_dir':
-            # Extract directory name (handle both quoted and unquoted)
-            groups = match.groups()
-            if len(groups) >= 2:
-                dir_name = groups[1] or groups[0]  # Take non-empty group
-            else:
-                dir_name = groups[0] if groups else 'newfolder'
-            return 'mkdir', [self.normalize_path(dir_name)]
-            
-        elif command_type == 'create_file':
-            groups = match.groups()
-            if len(groups) >= 2:
-                file_name = groups[1] or groups[0]
-            else:
-                file_name = groups[0] if groups else 'newfile.txt'
-            return 'touch', [file_name]
-            
-        elif command_type == 'list':
-            return 'ls', []
-            
-        elif command_type == 'list_detailed':
-            return 'ls', ['-l']
-            
-        elif command_type == 'change_dir':
-            groups = match.groups()
-            if len(groups) >= 2:
-                dir_name = groups[1] or groups[0]
-            else:
-                dir_name = groups[0] if groups else '.'
-            return 'cd', [self.normalize_path(dir_name)]
-            
-        elif command_type == 'go_home':
-            return 'cd', ['~']
-            
-        elif command_type == 'go_back':
-            return 'cd', ['..']
-            
-        elif command_type == 'current_dir':
-            return 'pwd', []
-            
-        elif command_type == 'remove_file':
-            groups = match.groups()
-            if len(groups) >= 2:
-                file_name = groups[1] or groups[0]
-            else:
-                file_name = groups[0] if groups else ''
-            return 'rm', [file_name] if file_name else ('rm', [])
-            
-        elif command_type == 'remove_dir':
-            groups = match.groups()
-            if len(groups) >= 2:
-                dir_name = groups[1] or groups[0]
-            else:
-                dir_name = groups[0] if groups else ''
-            return 'rm', ['-r', dir_name] if dir_name else ('rm', ['-r'])
-            
-        elif command_type == 'copy':
-            groups = match.groups()
-            if len(groups) >= 4:
-                source = groups[1] or groups[0]
-                dest = groups[3] or groups[2]
-                return 'cp', [source, dest]
-            return None, []
-            
-        elif command_type == 'move':
-            groups = match.groups()
-            if len(groups) >= 4:
-                source = groups[1] or groups[0]
-                dest = groups[3] or groups[2]
-                return 'mv', [source, dest]
-            return None, []
-            
-        elif command_type == 'show_file':
-            groups = match.groups()
-            if len(groups) >= 2:
-                file_name = groups[1] or groups[0]
-            else:
-                file_name = groups[0] if groups else ''
-            return 'cat', [file_name] if file_name else ('cat', [])
-            
-        elif command_type == 'find_file':
-            groups = match.groups()
-            if len(groups) >= 2:
-                pattern = groups[1] or groups[0]
-            else:
-                pattern = groups[0] if groups else '*'
-            return 'find', [pattern]
-            
-        elif command_type == 'system_info':
-            return 'sysinfo', []
-            
-        elif command_type == 'processes':
-            return 'ps', []
-            
-        elif command_type == 'memory':
-            return 'free', []
-            
-        elif command_type == 'disk_space':
-            return 'df', []
-            
-        elif command_type == 'clear_screen':
-            return 'clear', []
-            
-        elif command_type == 'help':
-            return 'help', []
-        
-        return None, []
+        return [(cmd, list(args)) for cmd, args in _interpret_cached(query.strip())]
     
     def get_suggestions(self, query: str) -> List[str]:
         """Get command suggestions based on partial query"""
-        suggestions = []
-        query_lower = query.lower()
-        
-        suggestion_map = {
-            'create': ['create folder myproject', 'create file readme.txt'],
-            'make': ['make directory docs', 'make file script.py'],
-            'list': ['list files', 'show directory contents'],
-            'show': ['show files', 'show system info', 'show processes'],
-            'copy': ['copy file1.txt to backup/', 'copy folder1 to archive/'],
-            'move': ['move file.txt to documents/', 'rename old.txt to new.txt'],
-            'delete': ['delete file unwanted.txt', 'remove folder oldstuff'],
-            'find': ['find file *.py', 'search for readme'],
-            'go': ['go to documents', 'go home', 'go back'],
-        }
-        
-        for keyword, examples in suggestion_map.items():
-            if keyword in query_lower:
-                suggestions.extend(examples)
+        # One scan finds every keyword occurrence, overlapping ones included
+        found = {match.group(1) for match in _SUGGESTION_PATTERN.finditer(query.lower())}
+        if not found:
+            return []
         
-        return suggestions[:5]  # Return top 5 suggestions
+        examples = (_SUGGESTION_MAP[keyword] for keyword in _SUGGESTION_MAP if keyword in found)
+        return list(itertools.islice(itertools.chain.from_iterable(examples), 5))  # Return top 5 suggestions
 
 
 class AICommands:
@@ -319,26 +438,7 @@ class AICommands:
     def cmd_ai(self, args: List[str]) -> str:
         """Process AI natural language commands"""
         if not args:
-            return f"""{Colors.CYAN}AI Assistant - Natural Language Commands{Colors.RESET}
-
-{Colors.YELLOW}Examples:{Colors.RESET}
-  ai create folder called projects
-  ai show me what files are here  
-  ai copy readme.txt to backup folder
-  ai go to documents directory
-  ai find files with .py extension
-  ai show system information
-  ai delete file olddata.txt
-
-{Colors.YELLOW}Supported operations:{Colors.RESET}
-  • File/folder creation, deletion, copying, moving
-  • Directory navigation and listing
-  • File searching and content viewing
-  • System information and process monitoring
-  • Memory and disk usage checking
-
-{Colors.GREEN}Try: ai <your command in plain English>{Colors.RESET}
-            """
+            return _AI_HELP
         
         query = " ".join(args)
         commands = self.interpreter.interpret(query)
@@ -354,9 +454,8 @@ class AICommands:
                 # Execute the command
                 result = self.terminal.execute(cmd_str)
                 if result:
-                    # Indent the output for better readability
-                    indented_result = '\n'.join(f"  {line}" for line in result.split('\n'))
-                    outputs.append(indented_result)
+                    # Indent the output for better readability (blank lines included)
+                    outputs.append(indent(result, '  ', _every_line))
             
             return '\n'.join(outputs)
         else:
@@ -2,13 +2,103 @@
 File Operations Commands - Handles all file system operations
 """
 
+import codecs
+import errno
+import io
 import os
+import re
 import shutil
+import stat
+import time
 import fnmatch
+import mmap
+from operator import attrgetter
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from filesystem.virtual_fs import VirtualFileSystem
 from utils.colors import Colors
+from utils.command_parser import parse_args
+
+# Characters read per chunk when streaming file contents
+CAT_CHUNK_SIZE = 65536
+
+# Files larger than this (in bytes) are read by cat through a memory map
+CAT_MMAP_THRESHOLD = 1 << 20
+
+# Files larger than this (in bytes) are grepped through a memory map
+GREP_MMAP_THRESHOLD = 1 << 20
+
+# Non-ASCII characters that a case-insensitive str regex matches for an ASCII letter
+_EXTRA_CASE_FOLDS = {'i': ('\u0130', '\u0131'), 'k': ('\u212a',), 's': ('\u017f',)}
+
+def _caseless_bytes_regex(pattern: str) -> re.Pattern:
+    """Compile an ASCII literal to a bytes regex matching what the str regex matches in UTF-8 text"""
+    parts = []
+    for char in pattern:
+        escaped = re.escape(char.encode('ascii'))
+        extra = _EXTRA_CASE_FOLDS.get(char.lower())
+        if extra:
+            escaped = b'(?:' + b'|'.join([escaped] + [fold.encode('utf-8') for fold in extra]) + b')'
+        parts.append(escaped)
+    return re.compile(b''.join(parts), re.IGNORECASE)
+
+def _mapped_text_chunks(file_name: str) -> Iterator[str]:
+    """Decode a file as UTF-8 through a read-only memory map, translating newlines like text mode"""
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(), translate=True)
+    with open(file_name, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            for start in range(0, len(view), CAT_CHUNK_SIZE):
+                # Release each slice even when decoding fails, so the map can close
+                with view[start:start + CAT_CHUNK_SIZE] as piece:
+                    chunk = decoder.decode(piece)
+                if chunk:
+                    yield chunk
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+def _copy_file(src: str, dst: str) -> str:
+    """
+    Copy a file with its metadata like shutil.copy2, in-kernel where possible
+    
+    On Linux os.copy_file_range moves the data without a user-space buffer
+    and lets filesystems such as btrfs and XFS share extents. Anything it
+    cannot handle (cross-device copies, older kernels, special files) falls
+    back to shutil.copyfile.
+    """
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    # Opening dst for writing would truncate src when both are the same file
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+    
+    copied = False
+    if hasattr(os, 'copy_file_range') and os.path.isfile(src):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                src_fd = fsrc.fileno()
+                dst_fd = fdst.fileno()
+                size = os.fstat(src_fd).st_size
+                # Pseudo files (procfs, sysfs, some FUSE) may report size 0 yet
+                # have content; leave those to shutil.copyfile
+                if size > 0:
+                    total = 0
+                    # Ask for the whole file each call so one call usually does it,
+                    # and copy until EOF rather than trusting st_size
+                    while True:
+                        sent = os.copy_file_range(src_fd, dst_fd, size)
+                        if sent == 0:
+                            break
+                        total += sent
+                    copied = total > 0
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+                raise
+    
+    if not copied:
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+    return dst
 
 class FileOperations:
     """Handles file and directory operations"""
@@ -19,9 +109,15 @@ class FileOperations:
     
     def cmd_ls(self, args: List[str]) -> str:
         """List directory contents"""
-        path = args[0] if args else '.'
-        detailed = '-l' in args or '--long' in args
-        all_files = '-a' in args or '--all' in args
+        parsed = parse_args(args)
+        path = parsed.positional[0] if parsed.positional else '.'
+        detailed = parsed.has('l', '--long')
+        all_files = parsed.has('a', '--all')
+        
+        # Resolve color codes once rather than per entry
+        BLUE = Colors.BLUE
+        RESET = Colors.RESET
+        YELLOW = Colors.YELLOW
         
         if self.use_virtual:
             current_path = self.virtual_fs.current_path if path == '.' else path
@@ -29,25 +125,39 @@ class FileOperations:
             if detailed:
                 items = self.virtual_fs.get_detailed_listing(current_path)
                 if not items:
-                    return f"{Colors.YELLOW}(empty directory){Colors.RESET}"
+                    return f"{YELLOW}(empty directory){RESET}"
                 
-                lines = []
+                # Write fields straight into one buffer instead of building per-line strings
+                buf = io.StringIO()
+                write = buf.write
                 for item in items:
                     size_str = str(item['size']).rjust(8) if item['type'] == 'file' else '     dir'
-                    color = Colors.BLUE if item['is_directory'] else Colors.RESET
-                    name = item['name'] + ('/' if item['is_directory'] else '')
-                    lines.append(f"{item['permissions']} {size_str} {item['modified']} {color}{name}{Colors.RESET}")
-                return '\n'.join(lines)
+                    if item['is_directory']:
+                        color, suffix = BLUE, '/'
+                    else:
+                        color, suffix = RESET, ''
+                    write(item['permissions'])
+                    write(' ')
+                    write(size_str)
+                    write(' ')
+                    write(item['modified'])
+                    write(' ')
+                    write(color)
+                    write(item['name'])
+                    write(suffix)
+                    write(RESET)
+                    write('\n')
+                return buf.getvalue()[:-1]
             else:
                 items = self.virtual_fs.list_directory(current_path)
                 if not items:
-                    return f"{Colors.YELLOW}(empty directory){Colors.RESET}"
+                    return f"{YELLOW}(empty directory){RESET}"
                 
                 # Color directories and files differently
                 colored_items = []
                 for item in items:
                     if item.endswith('/'):
-                        colored_items.append(f"{Colors.BLUE}{item}{Colors.RESET}")
+                        colored_items.append(''.join((BLUE, item, RESET)))
                     else:
                         colored_items.append(item)
                 
@@ -55,46 +165,65 @@ class FileOperations:
         else:
             try:
                 actual_path = os.path.expanduser(path)
-                items = os.listdir(actual_path)
                 
-                if not all_files:
-                    items = [item for item in items if not item.startswith('.')]
+                # DirEntry caches type information from the directory read itself
+                with os.scandir(actual_path) as it:
+                    if all_files:
+                        entries = list(it)
+                    else:
+                        entries = [entry for entry in it if not entry.name.startswith('.')]
+                # Hidden entries are dropped before sorting; the key runs at C speed
+                entries.sort(key=attrgetter('name'))
                 
                 if detailed:
-                    lines = []
-                    for item in sorted(items):
-                        item_path = os.path.join(actual_path, item)
-                        stat_info = os.stat(item_path)
+                    buf = io.StringIO()
+                    write = buf.write
+                    # Entries modified in the same minute share a timestamp string
+                    time_strs = {}
+                    for entry in entries:
+                        # One stat per entry supplies type, permissions, size and time
+                        stat_info = entry.stat()
+                        is_dir = stat.S_ISDIR(stat_info.st_mode)
                         
                         # Format permissions
-                        perms = '-' if os.path.isfile(item_path) else 'd'
-                        perms += 'rwx' if os.access(item_path, os.R_OK | os.W_OK | os.X_OK) else '---'
-                        perms += 'r-x' * 2  # Simplified permissions
+                        perms = stat.filemode(stat_info.st_mode)
                         
                         # Format size
                         size = stat_info.st_size
                         
                         # Format time
-                        import datetime
-                        mod_time = datetime.datetime.fromtimestamp(stat_info.st_mtime)
-                        time_str = mod_time.strftime('%b %d %H:%M')
+                        minute = int(stat_info.st_mtime // 60)
+                        time_str = time_strs.get(minute)
+                        if time_str is None:
+                            time_str = time_strs[minute] = time.strftime('%b %d %H:%M', time.localtime(stat_info.st_mtime))
                         
                         # Color
-                        color = Colors.BLUE if os.path.isdir(item_path) else Colors.RESET
-                        name = item + ('/' if os.path.isdir(item_path) else '')
+                        if is_dir:
+                            color, suffix = BLUE, '/'
+                        else:
+                            color, suffix = RESET, ''
                         
-                        lines.append(f"{perms} {size:8d} {time_str} {color}{name}{Colors.RESET}")
+                        write(perms)
+                        write(' ')
+                        write(format(size, '8d'))
+                        write(' ')
+                        write(time_str)
+                        write(' ')
+                        write(color)
+                        write(entry.name)
+                        write(suffix)
+                        write(RESET)
+                        write('\n')
                     
-                    return '\n'.join(lines)
+                    return buf.getvalue()[:-1]
                 else:
                     # Simple listing with colors
                     colored_items = []
-                    for item in sorted(items):
-                        item_path = os.path.join(actual_path, item)
-                        if os.path.isdir(item_path):
-                            colored_items.append(f"{Colors.BLUE}{item}/{Colors.RESET}")
+                    for entry in entries:
+                        if entry.is_dir():
+                            colored_items.append(''.join((BLUE, entry.name, '/', RESET)))
                         else:
-                            colored_items.append(item)
+                            colored_items.append(entry.name)
                     
                     return "  ".join(colored_items)
                     
@@ -139,23 +268,26 @@ class FileOperations:
         if not args:
             return f"{Colors.YELLOW}Usage: mkdir <directory_name>{Colors.RESET}"
         
-        for dir_name in args:
-            if dir_name.startswith('-'):
-                continue  # Skip options
-            
-            if self.use_virtual:
-                if self.virtual_fs.create_directory(dir_name):
-                    return f"{Colors.GREEN}Directory created: {dir_name}{Colors.RESET}"
+        # Options such as -p are skipped
+        dir_names = parse_args(args).positional
+        
+        results = []
+        if self.use_virtual:
+            outcomes = self.virtual_fs.create_directories(dir_names)
+            for dir_name, created in outcomes:
+                if created:
+                    results.append(f"{Colors.GREEN}Directory created: {dir_name}{Colors.RESET}")
                 else:
-                    return f"{Colors.RED}Failed to create directory: {dir_name}{Colors.RESET}"
-            else:
+                    results.append(f"{Colors.RED}Failed to create directory: {dir_name}{Colors.RESET}")
+        else:
+            for dir_name in dir_names:
                 try:
                     os.makedirs(dir_name, exist_ok=True)
-                    return f"{Colors.GREEN}Directory created: {dir_name}{Colors.RESET}"
+                    results.append(f"{Colors.GREEN}Directory created: {dir_name}{Colors.RESET}")
                 except Exception as e:
-                    return f"{Colors.RED}Error creating directory: {str(e)}{Colors.RESET}"
+                    results.append(f"{Colors.RED}Error creating directory: {str(e)}{Colors.RESET}")
         
-        return ""
+        return '\n'.join(results)
     
     def cmd_rmdir(self, args: List[str]) -> str:
         """Remove empty directory"""
@@ -165,9 +297,9 @@ class FileOperations:
         dir_name = args[0]
         
         if self.use_virtual:
-            if self.virtual_fs.is_directory(dir_name):
-                items = self.virtual_fs.list_directory(dir_name)
-                if items:
+            node = self.virtual_fs.get_node(dir_name)
+            if node is not None and node.get('type') == 'directory':
+                if self.virtual_fs.list_directory(dir_name):
                     return f"{Colors.RED}Directory not empty: {dir_name}{Colors.RESET}"
                 else:
                     if self.virtual_fs.remove_item(dir_name):
@@ -185,45 +317,46 @@ class FileOperations:
         if not args:
             return f"{Colors.YELLOW}Usage: rm <file_or_directory>{Colors.RESET}"
         
-        recursive = '-r' in args or '--recursive' in args
-        force = '-f' in args or '--force' in args
-        
-        # Filter out options
-        items_to_remove = [arg for arg in args if not arg.startswith('-')]
+        parsed = parse_args(args)
+        items_to_remove = parsed.positional
+        recursive = parsed.has('r', '--recursive')
+        force = parsed.has('f', '--force')
         
         if not items_to_remove:
             return f"{Colors.YELLOW}No items specified for removal{Colors.RESET}"
         
+        if self.use_virtual:
+            outcomes = self.virtual_fs.remove_many(items_to_remove, recursive, force)
+            
+            results = []
+            for item_name, status in outcomes:
+                if status == 'removed':
+                    results.append(f"{Colors.GREEN}Removed: {item_name}{Colors.RESET}")
+                elif status == 'is_directory':
+                    results.append(f"{Colors.RED}Cannot remove directory '{item_name}': use -r for recursive{Colors.RESET}")
+                elif status == 'not_found':
+                    results.append(f"{Colors.RED}File not found: {item_name}{Colors.RESET}")
+                else:
+                    results.append(f"{Colors.RED}Failed to remove: {item_name}{Colors.RESET}")
+            return '\n'.join(results)
+        
         results = []
         for item_name in items_to_remove:
-            if self.use_virtual:
-                if self.virtual_fs.exists(item_name):
-                    if self.virtual_fs.is_directory(item_name) and not recursive:
-                        results.append(f"{Colors.RED}Cannot remove directory '{item_name}': use -r for recursive{Colors.RESET}")
+            try:
+                if os.path.isdir(item_name):
+                    if recursive:
+                        shutil.rmtree(item_name)
+                        results.append(f"{Colors.GREEN}Removed directory: {item_name}{Colors.RESET}")
                     else:
-                        if self.virtual_fs.remove_item(item_name):
-                            results.append(f"{Colors.GREEN}Removed: {item_name}{Colors.RESET}")
-                        else:
-                            results.append(f"{Colors.RED}Failed to remove: {item_name}{Colors.RESET}")
+                        results.append(f"{Colors.RED}Cannot remove directory '{item_name}': use -r for recursive{Colors.RESET}")
                 else:
-                    if not force:
-                        results.append(f"{Colors.RED}File not found: {item_name}{Colors.RESET}")
-            else:
-                try:
-                    if os.path.isdir(item_name):
-                        if recursive:
-                            shutil.rmtree(item_name)
-                            results.append(f"{Colors.GREEN}Removed directory: {item_name}{Colors.RESET}")
-                        else:
-                            results.append(f"{Colors.RED}Cannot remove directory '{item_name}': use -r for recursive{Colors.RESET}")
-                    else:
-                        os.remove(item_name)
-                        results.append(f"{Colors.GREEN}Removed: {item_name}{Colors.RESET}")
-                except FileNotFoundError:
-                    if not force:
-                        results.append(f"{Colors.RED}File not found: {item_name}{Colors.RESET}")
-                except Exception as e:
-                    results.append(f"{Colors.RED}Error removing {item_name}: {str(e)}{Colors.RESET}")
+                    os.remove(item_name)
+                    results.append(f"{Colors.GREEN}Removed: {item_name}{Colors.RESET}")
+            except FileNotFoundError:
+                if not force:
+                    results.append(f"{Colors.RED}File not found: {item_name}{Colors.RESET}")
+            except Exception as e:
+                results.append(f"{Colors.RED}Error removing {item_name}: {str(e)}{Colors.RESET}")
         
         return '\n'.join(results)
     
@@ -235,12 +368,10 @@ class FileOperations:
         results = []
         for file_name in args:
             if self.use_virtual:
-                if self.virtual_fs.exists(file_name):
+                node = self.virtual_fs.get_node(file_name)
+                if node is not None:
                     # File exists, update timestamp (simulated)
-                    node = self.virtual_fs.get_node(file_name)
-                    if node and node.get('type') == 'file':
-                        import datetime
-                        node['modified'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    if self.virtual_fs.touch_file(file_name):
                         results.append(f"{Colors.GREEN}Updated timestamp: {file_name}{Colors.RESET}")
                 else:
                     if self.virtual_fs.create_file(file_name):
@@ -258,40 +389,59 @@ class FileOperations:
     
     def cmd_cat(self, args: List[str]) -> str:
         """Display file contents"""
+        return ''.join(self.cmd_cat_stream(args))
+    
+    def cmd_cat_stream(self, args: List[str]) -> Iterator[str]:
+        """
+        Yield file contents in chunks without holding whole files in memory
+        
+        Files are separated by a newline, matching cmd_cat. A file that turns
+        out not to be valid UTF-8 part-way through reports the error after
+        the text already streamed.
+        """
         if not args:
-            return f"{Colors.YELLOW}Usage: cat <filename>{Colors.RESET}"
+            yield f"{Colors.YELLOW}Usage: cat <filename>{Colors.RESET}"
+            return
         
-        results = []
-        for file_name in args:
+        for index, file_name in enumerate(args):
+            if index:
+                yield '\n'
+            
             if self.use_virtual:
                 content = self.virtual_fs.read_file(file_name)
                 if content is not None:
-                    results.append(content)
+                    yield content
                 else:
-                    results.append(f"{Colors.RED}File not found or is not a file: {file_name}{Colors.RESET}")
+                    yield f"{Colors.RED}File not found or is not a file: {file_name}{Colors.RESET}"
             else:
                 try:
-                    with open(file_name, 'r', encoding='utf-8') as f:
-                        results.append(f.read())
+                    if os.path.getsize(file_name) > CAT_MMAP_THRESHOLD:
+                        # Decode straight from the page cache instead of copying into a read buffer
+                        yield from _mapped_text_chunks(file_name)
+                    else:
+                        with open(file_name, 'r', encoding='utf-8') as f:
+                            while True:
+                                chunk = f.read(CAT_CHUNK_SIZE)
+                                if not chunk:
+                                    break
+                                yield chunk
                 except FileNotFoundError:
-                    results.append(f"{Colors.RED}File not found: {file_name}{Colors.RESET}")
+                    yield f"{Colors.RED}File not found: {file_name}{Colors.RESET}"
                 except IsADirectoryError:
-                    results.append(f"{Colors.RED}Is a directory: {file_name}{Colors.RESET}")
+                    yield f"{Colors.RED}Is a directory: {file_name}{Colors.RESET}"
                 except UnicodeDecodeError:
-                    results.append(f"{Colors.RED}Binary file: {file_name}{Colors.RESET}")
+                    yield f"{Colors.RED}Binary file: {file_name}{Colors.RESET}"
                 except Exception as e:
-                    results.append(f"{Colors.RED}Error reading file: {str(e)}{Colors.RESET}")
-        
-        return '\n'.join(results)
+                    yield f"{Colors.RED}Error reading file: {str(e)}{Colors.RESET}"
     
     def cmd_cp(self, args: List[str]) -> str:
         """Copy file or directory"""
         if len(args) < 2:
             return f"{Colors.YELLOW}Usage: cp <source> <destination>{Colors.RESET}"
         
-        recursive = '-r' in args or '--recursive' in args
-        # Filter out options
-        file_args = [arg for arg in args if not arg.startswith('-')]
+        parsed = parse_args(args)
+        file_args = parsed.positional
+        recursive = parsed.has('r', '--recursive')
         
         if len(file_args) < 2:
             return f"{Colors.YELLOW}Usage: cp <source> <destination>{Colors.RESET}"
@@ -299,10 +449,11 @@ class FileOperations:
         source, dest = file_args[0], file_args[1]
         
         if self.use_virtual:
-            if not self.virtual_fs.exists(source):
+            source_node = self.virtual_fs.get_node(source)
+            if source_node is None:
                 return f"{Colors.RED}Source not found: {source}{Colors.RESET}"
             
-            if self.virtual_fs.is_directory(source) and not recursive:
+            if source_node.get('type') == 'directory' and not recursive:
                 return f"{Colors.RED}Cannot copy directory '{source}': use -r for recursive{Colors.RESET}"
             
             if self.virtual_fs.copy_item(source, dest):
@@ -313,12 +464,12 @@ class FileOperations:
             try:
                 if os.path.isdir(source):
                     if recursive:
-                        shutil.copytree(source, dest)
+                        shutil.copytree(source, dest, copy_function=_copy_file)
                         return f"{Colors.GREEN}Copied directory {source} to {dest}{Colors.RESET}"
                     else:
                         return f"{Colors.RED}Cannot copy directory '{source}': use -r for recursive{Colors.RESET}"
                 else:
-                    shutil.copy2(source, dest)
+                    _copy_file(source, dest)
                     return f"{Colors.GREEN}Copied {source} to {dest}{Colors.RESET}"
             except Exception as e:
                 return f"{Colors.RED}Error: {str(e)}{Colors.RESET}"
@@ -331,7 +482,7 @@ class FileOperations:
         source, dest = args[0], args[1]
         
         if self.use_virtual:
-            if not self.virtual_fs.exists(source):
+            if self.virtual_fs.get_node(source) is None:
                 return f"{Colors.RED}Source not found: {source}{Colors.RESET}"
             
             if self.virtual_fs.move_item(source, dest):
@@ -350,11 +501,18 @@ class FileOperations:
         if not args:
             return f"{Colors.YELLOW}Usage: find <pattern>{Colors.RESET}"
         
-        pattern = args[0]
-        search_path = args[1] if len(args) > 1 else None
+        parsed = parse_args(args)
+        positionals = parsed.positional
+        if not positionals:
+            return f"{Colors.YELLOW}Usage: find <pattern>{Colors.RESET}"
+        
+        pattern = positionals[0]
+        search_path = positionals[1] if len(positionals) > 1 else None
+        # Names are matched case-sensitively like find(1); -i opts out
+        ignore_case = parsed.has('i', '--ignore-case')
         
         if self.use_virtual:
-            matches = self.virtual_fs.find_files(pattern, search_path)
+            matches = self.virtual_fs.find_files(pattern, search_path, ignore_case)
             if matches:
                 return '\n'.join(matches)
             else:
@@ -362,12 +520,11 @@ class FileOperations:
         else:
             try:
                 start_path = search_path or '.'
-                matches = []
                 
-                for root, dirs, files in os.walk(start_path):
-                    for file in files:
-                        if fnmatch.fnmatch(file.lower(), pattern.lower()):
-                            matches.append(os.path.join(root, file))
+                # Translate the glob once instead of per file
+                regex = re.compile(fnmatch.translate(pattern), re.IGNORECASE if ignore_case else 0)
+                
+                matches = self._find_matching_files(start_path, regex)
                 
                 if matches:
                     return '\n'.join(matches)
@@ -376,6 +533,56 @@ class FileOperations:
             except Exception as e:
                 return f"{Colors.RED}Error: {str(e)}{Colors.RESET}"
     
+    def _find_matching_files(self, start_path: str, regex) -> List[str]:
+        """
+        Walk a directory tree and collect files whose names match a regex
+        
+        Uses os.scandir directly so file types come from the directory read
+        and names are filtered without building per-directory file lists.
+        Traversal order and symlink handling match os.walk: files of a
+        directory come before its subdirectories, symlinked directories are
+        not descended into, and unreadable directories are skipped.
+        
+        Args:
+            start_path: Directory to start searching from
+            regex: Compiled pattern matched against each file name
+            
+        Returns:
+            List of matching file paths
+        """
+        matches = []
+        pending = [start_path]
+        
+        # Bind hot-loop callables once; they are most of the per-entry work
+        match = regex.match
+        append = matches.append
+        
+        while pending:
+            current = pending.pop()
+            try:
+                with os.scandir(current) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            
+            subdirs = []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                
+                if not is_dir:
+                    if match(entry.name):
+                        append(entry.path)
+                elif not entry.is_symlink():
+                    subdirs.append(entry.path)
+            
+            # Reverse so subdirectories are visited in listing order
+            pending.extend(reversed(subdirs))
+        
+        return matches
+    
     def cmd_grep(self, args: List[str]) -> str:
         """Search for pattern in files"""
         if len(args) < 2:
@@ -384,6 +591,9 @@ class FileOperations:
         pattern = args[0]
         file_name = args[1]
         
+        # Case-insensitive literal search, compiled once for all lines
+        regex = re.compile(re.escape(pattern), re.IGNORECASE)
+        
         if self.use_virtual:
             content = self.virtual_fs.read_file(file_name)
             if content is None:
@@ -391,7 +601,7 @@ class FileOperations:
             
             matches = []
             for line_no, line in enumerate(content.split('\n'), 1):
-                if pattern.lower() in line.lower():
+                if regex.search(line):
                     matches.append(f"{Colors.CYAN}{line_no}:{Colors.RESET} {line}")
             
             if matches:
@@ -400,15 +610,100 @@ class FileOperations:
                 return f"{Colors.YELLOW}Pattern not found: {pattern}{Colors.RESET}"
         else:
             try:
+                matches = None
+                if pattern.isascii() and os.path.getsize(file_name) > GREP_MMAP_THRESHOLD:
+                    matches = self._grep_mapped(file_name, pattern)
+                if matches is not None:
+                    if matches:
+                        return '\n'.join(matches)
+                    else:
+                        return f"{Colors.YELLOW}Pattern not found: {pattern}{Colors.RESET}"
+                
                 matches = []
                 with open(file_name, 'r', encoding='utf-8') as f:
                     for line_no, line in enumerate(f, 1):
-                        if pattern.lower() in line.lower():
-                            matches.append(f"{Colors.CYAN}{line_no}:{Colors.RESET} {line.rstrip()}")
+                        if regex.search(line):
+                            # Only drop the newline; trailing whitespace is part of the line
+                            line = line.rstrip('\n')
+                            matches.append(f"{Colors.CYAN}{line_no}:{Colors.RESET} {line}")
                 
                 if matches:
                     return '\n'.join(matches)
                 else:
                     return f"{Colors.YELLOW}Pattern not found: {pattern}{Colors.RESET}"
             except Exception as e:
-                return f"{Colors.RED}Error: {str(e)}{Colors.RESET}"
\ No newline at end of file
+                return f"{Colors.RED}Error: {str(e)}{Colors.RESET}"
+    
+    def _grep_mapped(self, file_name: str, pattern: str) -> Optional[List[str]]:
+        """
+        Search a large file through a read-only memory map
+        
+        The pattern is searched over the mapped bytes so only matching lines
+        are ever decoded; line numbers come from counting newlines between
+        matches. Patterns without letters need no case folding and are
+        located with a plain mmap.find (memmem) instead of the regex.
+        
+        Carriage returns and UTF-8 are checked only on the bytes the search
+        already slices: a matching line that is not valid UTF-8 or holds a
+        lone carriage return, or a lone carriage return before a match (it
+        would shift line numbers), returns None so the file is left to the
+        text path. Lines that do not match are never decoded.
+        
+        Args:
+            file_name: Path of the file to search
+            pattern: ASCII pattern, matched case-insensitively
+            
+        Returns:
+            Formatted matching lines, or None if the file needs the text path
+        """
+        needle = pattern.encode('ascii')
+        caseless = needle.lower() == needle.upper()
+        regex = _caseless_bytes_regex(pattern)
+        matches = []
+        
+        with open(file_name, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            find = mm.find
+            search = regex.search
+            line_no = 1
+            counted = 0
+            pos = 0
+            
+            while pos < size:
+                if caseless:
+                    hit = find(needle, pos)
+                    if hit == -1:
+                        break
+                else:
+                    found = search(mm, pos)
+                    if found is None:
+                        break
+                    hit = found.start()
+                
+                line_start = mm.rfind(b'\n', 0, hit) + 1
+                line_end = find(b'\n', hit)
+                if line_end == -1:
+                    line_end = size
+                
+                skipped = mm[counted:line_start]
+                if b'\r' in skipped and skipped.count(b'\r') != skipped.count(b'\r\n'):
+                    return None
+                line_no += skipped.count(b'\n')
+                counted = line_start
+                
+                # Text mode reads CRLF as a plain newline
+                line = mm[line_start:line_end]
+                if line.endswith(b'\r'):
+                    line = line[:-1]
+                if b'\r' in line:
+                    return None
+                try:
+                    text = line.decode('utf-8')
+                except UnicodeDecodeError:
+                    return None
+                matches.append(f"{Colors.CYAN}{line_no}:{Colors.RESET} {text}")
+                
+                # Continue after this line so each line is reported once
+                pos = line_end + 1
+        
+        return matches
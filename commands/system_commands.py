@@ -5,8 +5,10 @@ System Commands - Handles system information and process management
 import os
 import sys
 import platform
-from datetime import datetime
-from typing import List
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Tuple
 from utils.colors import Colors
 
 try:
@@ -15,45 +17,217 @@ try:
 except ImportError:
     PSUTIL_AVAILABLE = False
 
+# Host identity never changes while the process runs; read uname once
+_UNAME = platform.uname()
+
+# Virtual filesystems df skips without paying for a statvfs call
+_PSEUDO_FSTYPES = frozenset({
+    'tmpfs', 'devtmpfs', 'squashfs', 'overlay', 'proc', 'sysfs', 'cgroup', 'cgroup2'
+})
+
+_NO_PSUTIL_MESSAGE = f"{Colors.RED}psutil not available. Install with: pip install psutil{Colors.RESET}"
+_NO_PSUTIL_UPTIME_MESSAGE = f"{Colors.YELLOW}System uptime information requires psutil{Colors.RESET}"
+
+# Table headers are fixed once Colors is configured; build them at import
+_PS_HEADER = f"{Colors.CYAN}{'PID':>7} {'NAME':20} {'CPU%':>6} {'MEM%':>6} {'STATUS':10}{Colors.RESET}"
+_DF_HEADER = '\n'.join((
+    f"{Colors.CYAN}Disk Usage:{Colors.RESET}",
+    f"{'Filesystem':20} {'Size':>10} {'Used':>10} {'Avail':>10} {'Use%':>5} {'Mounted on':15}",
+    '-' * 75
+))
+_FREE_HEADER = '\n'.join((
+    f"{Colors.CYAN}Memory Usage:{Colors.RESET}",
+    f"{'':14} {'Total':>8} {'Used':>8} {'Free':>8} {'Available':>10} {'Buff/Cache':>11}",
+    '-' * 65
+))
+
+_BYTE_UNITS = ('B', 'K', 'M', 'G', 'T')
+
+def _format_bytes(bytes_val) -> str:
+    """Format a byte count in binary units, picking the unit from the bit length"""
+    index = min((int(bytes_val).bit_length() - 1) // 10, 4) if bytes_val >= 1024 else 0
+    return f"{bytes_val / (1 << (10 * index)):7.1f}{_BYTE_UNITS[index]}"
+
+def _linux_fast_snapshot() -> Dict[str, float]:
+    """Read memory, swap, load and uptime figures straight from /proc in one pass"""
+    with open('/proc/meminfo', 'rb') as f:
+        fields = f.read().split()
+    # Lines look like b'MemTotal:  16318280 kB'; values are in KiB
+    meminfo = {}
+    for i in range(len(fields) - 1):
+        if fields[i].endswith(b':'):
+            meminfo[fields[i][:-1]] = int(fields[i + 1]) * 1024
+    with open('/proc/loadavg', 'rb') as f:
+        load1 = float(f.read().split(None, 1)[0])
+    with open('/proc/uptime', 'rb') as f:
+        uptime_s = float(f.read().split(None, 1)[0])
+    
+    mem_total = meminfo[b'MemTotal']
+    mem_avail = meminfo.get(b'MemAvailable', meminfo[b'MemFree'])
+    mem_used = mem_total - mem_avail
+    swap_total = meminfo.get(b'SwapTotal', 0)
+    swap_free = meminfo.get(b'SwapFree', 0)
+    swap_used = swap_total - swap_free
+    return {
+        'mem_total': mem_total,
+        'mem_avail': mem_avail,
+        'mem_free': meminfo[b'MemFree'],
+        'mem_used': mem_used,
+        'mem_percent': mem_used / mem_total * 100 if mem_total else 0.0,
+        'swap_total': swap_total,
+        'swap_free': swap_free,
+        'swap_used': swap_used,
+        'swap_percent': swap_used / swap_total * 100 if swap_total else 0.0,
+        'load1': load1,
+        'uptime_s': uptime_s,
+    }
+
+def _fast_pids_linux(limit: int) -> List[int]:
+    """List up to limit PIDs by scanning /proc, stopping as soon as enough are found"""
+    pids = []
+    with os.scandir('/proc') as it:
+        for entry in it:
+            if entry.name.isdigit():
+                pids.append(int(entry.name))
+                if len(pids) >= limit:
+                    break
+    return pids
+
+def _count_pids_linux() -> int:
+    """Count running processes from the numeric entries in /proc"""
+    with os.scandir('/proc') as it:
+        return sum(1 for entry in it if entry.name.isdigit())
+
+# Latest whole-system CPU usage published by the background sampler
+_cpu_sample = {'percent': None}
+_cpu_sampler_lock = threading.Lock()
+_cpu_sampler_started = False
+
+def _sample_cpu_forever():
+    """Measure CPU usage over one-second windows for the life of the process"""
+    while True:
+        _cpu_sample['percent'] = psutil.cpu_percent(interval=1.0)
+
+def _start_cpu_sampler():
+    """Start the shared CPU sampler thread once per process"""
+    global _cpu_sampler_started
+    with _cpu_sampler_lock:
+        if not _cpu_sampler_started:
+            threading.Thread(target=_sample_cpu_forever, name='cpu-sampler', daemon=True).start()
+            _cpu_sampler_started = True
+
 class SystemCommands:
     """Handles system information and process commands"""
     
     def __init__(self):
         self.psutil_available = PSUTIL_AVAILABLE
+        # Recent psutil readings reused by back-to-back commands: key -> (taken_at, value)
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+        # Process objects from the last `ps`, kept so cpu_percent has a baseline
+        self._ps_procs: Dict[int, Any] = {}
+        
+        if not self.psutil_available:
+            # Bind the fallbacks once so the commands never test for psutil per call
+            for name in ('cmd_ps', 'cmd_top', 'cmd_kill', 'cmd_df', 'cmd_free'):
+                setattr(self, name, self._cmd_no_psutil)
+            self.cmd_uptime = self._cmd_uptime_no_psutil
+        else:
+            # Prime the CPU counters so later non-blocking reads have a baseline
+            psutil.cpu_percent(interval=None)
+            # One sampler serves every session instead of a thread per terminal
+            _start_cpu_sampler()
+            # Boot time is fixed for the life of the process
+            self._boot_ts = psutil.boot_time()
+            self._boot_time = datetime.fromtimestamp(self._boot_ts)
+            # So are the core counts
+            self._cpu_count = psutil.cpu_count(logical=False)
+            self._cpu_count_logical = psutil.cpu_count(logical=True)
+    
+    def _cmd_no_psutil(self, args: List[str]) -> str:
+        """Stand-in for commands that need psutil when it is not installed"""
+        return _NO_PSUTIL_MESSAGE
+    
+    def _cmd_uptime_no_psutil(self, args: List[str]) -> str:
+        """Fallback uptime without psutil"""
+        return _NO_PSUTIL_UPTIME_MESSAGE
+    
+    def _cached(self, key: str, ttl: float, fetch: Callable[[], Any]) -> Any:
+        """Return a cached psutil reading, refreshing it once older than ttl seconds"""
+        now = time.monotonic()
+        entry = self._cache.get(key)
+        if entry is not None and now - entry[0] < ttl:
+            return entry[1]
+        value = fetch()
+        self._cache[key] = (now, value)
+        return value
+    
+    def _memory_snapshot(self) -> Dict[str, float]:
+        """Memory and swap figures shared by top and free, from /proc on Linux"""
+        if sys.platform == 'linux':
+            return _linux_fast_snapshot()
+        memory = self._cached('vmem', 1.0, psutil.virtual_memory)
+        swap = self._cached('swap', 1.0, psutil.swap_memory)
+        return {
+            'mem_total': memory.total,
+            'mem_avail': memory.available,
+            'mem_free': memory.free,
+            'mem_used': memory.used,
+            'mem_percent': memory.percent,
+            'swap_total': swap.total,
+            'swap_free': swap.free,
+            'swap_used': swap.used,
+            'swap_percent': swap.percent,
+        }
     
     def cmd_ps(self, args: List[str]) -> str:
         """Show running processes"""
-        if not self.psutil_available:
-            return f"{Colors.RED}psutil not available. Install with: pip install psutil{Colors.RESET}"
-        
         try:
-            processes = []
-            header = f"{Colors.CYAN}{'PID':>7} {'NAME':20} {'CPU%':>6} {'MEM%':>6} {'STATUS':10}{Colors.RESET}"
-            processes.append(header)
-            
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent', 'status']):
+            processes = [_PS_HEADER]
+            
+            # Only build Process objects for the rows actually shown; on Linux
+            # oversample a few PIDs past the 25 rows to cover vanished processes
+            pids = _fast_pids_linux(40) if sys.platform == 'linux' else psutil.pids()
+            # Reuse last call's Process objects: a fresh one has no earlier CPU
+            # times to compare with, so its cpu_percent() is always 0.0
+            known = self._ps_procs
+            shown = {}
+            for pid in pids:
+                if pid == 0:  # Skip system idle process
+                    continue
+                
                 try:
-                    pinfo = proc.info
-                    if pinfo['pid'] == 0:  # Skip system idle process
-                        continue
-                    
-                    # Truncate long process names
-                    name = pinfo['name'][:19] if pinfo['name'] else 'N/A'
-                    
-                    line = (f"{pinfo['pid']:7d} {name:20} "
-                           f"{pinfo['cpu_percent']:5.1f}% "
-                           f"{pinfo['memory_percent']:5.1f}% "
-                           f"{pinfo['status'][:9]:10}")
-                    
-                    processes.append(line)
-                    
-                    # Limit output to prevent overwhelming
-                    if len(processes) > 25:
-                        break
-                        
+                    proc = known.get(pid)
+                    if proc is None:
+                        proc = psutil.Process(pid)
+                    # Share one read of the process' stat files across the lookups
+                    with proc.oneshot():
+                        if not proc.is_running():
+                            # The PID was reused; start a new baseline
+                            proc = psutil.Process(pid)
+                        name = proc.name()
+                        cpu_percent = proc.cpu_percent()
+                        memory_percent = proc.memory_percent()
+                        status = proc.status()
                 except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                     continue
+                shown[pid] = proc
+                
+                # Truncate long process names
+                name = name[:19] if name else 'N/A'
+                
+                line = (f"{pid:7d} {name:20} "
+                       f"{cpu_percent:5.1f}% "
+                       f"{memory_percent:5.1f}% "
+                       f"{status[:9]:10}")
+                
+                processes.append(line)
+                
+                # Limit output to prevent overwhelming
+                if len(processes) > 25:
+                    break
             
+            # Exited processes drop out here
+            self._ps_procs = shown
             return '\n'.join(processes)
             
         except Exception as e:
@@ -61,17 +235,45 @@ class SystemCommands:
     
     def cmd_top(self, args: List[str]) -> str:
         """Show system resource usage"""
-        if not self.psutil_available:
-            return f"{Colors.RED}psutil not available. Install with: pip install psutil{Colors.RESET}"
-        
         try:
             # Get system information
-            cpu_percent = psutil.cpu_percent(interval=1, percpu=False)
-            cpu_count = psutil.cpu_count(logical=False)
-            cpu_count_logical = psutil.cpu_count(logical=True)
-            
-            memory = psutil.virtual_memory()
-            swap = psutil.swap_memory()
+            # Read the sampler's last one-second window; until it has reported,
+            # fall back to usage since the previous non-blocking reading
+            cpu_percent = _cpu_sample['percent']
+            if cpu_percent is None:
+                cpu_percent = psutil.cpu_percent(interval=None, percpu=False)
+            cpu_count = self._cpu_count
+            cpu_count_logical = self._cpu_count_logical
+            
+            # On Linux this reads /proc directly rather than going through psutil per figure
+            snap = self._memory_snapshot()
+            mem_total = snap['mem_total']
+            mem_avail = snap['mem_avail']
+            mem_free = snap['mem_free']
+            mem_used = snap['mem_used']
+            mem_percent = snap['mem_percent']
+            swap_total = snap['swap_total']
+            swap_free = snap['swap_free']
+            swap_used = snap['swap_used']
+            swap_percent = snap['swap_percent']
+            
+            boot_time = self._boot_time
+            if sys.platform == 'linux':
+                load_avg = f"{snap['load1']:.2f}"
+                uptime = timedelta(seconds=snap['uptime_s'])
+                process_count = _count_pids_linux()
+            else:
+                uptime = datetime.now() - boot_time
+                # Enumerating every PID is the slow part here, so reuse a recent count
+                process_count = self._cached('pid_count', 2.0, lambda: len(psutil.pids()))
+                
+                # Get load average (Unix only)
+                load_avg = "N/A"
+                if hasattr(os, 'getloadavg'):
+                    try:
+                        load_avg = f"{os.getloadavg()[0]:.2f}"
+                    except:
+                        pass
             
             # Get disk usage for root/main drive
             try:
@@ -80,18 +282,6 @@ class SystemCommands:
             except:
                 disk_available = False
             
-            # Get boot time
-            boot_time = datetime.fromtimestamp(psutil.boot_time())
-            uptime = datetime.now() - boot_time
-            
-            # Get load average (Unix only)
-            load_avg = "N/A"
-            if hasattr(os, 'getloadavg'):
-                try:
-                    load_avg = f"{os.getloadavg()[0]:.2f}"
-                except:
-                    pass
-            
             # Format output
             output = f"""
 {Colors.CYAN}System Resource Usage:{Colors.RESET}
@@ -104,15 +294,15 @@ class SystemCommands:
   Load average:   {load_avg}
 
 {Colors.GREEN}Memory Information:{Colors.RESET}
-  Total:     {memory.total / (1024**3):8.1f} GB
-  Available: {memory.available / (1024**3):8.1f} GB
-  Used:      {memory.used / (1024**3):8.1f} GB ({memory.percent:5.1f}%)
-  Free:      {memory.free / (1024**3):8.1f} GB
+  Total:     {mem_total / (1024**3):8.1f} GB
+  Available: {mem_avail / (1024**3):8.1f} GB
+  Used:      {mem_used / (1024**3):8.1f} GB ({mem_percent:5.1f}%)
+  Free:      {mem_free / (1024**3):8.1f} GB
 
 {Colors.GREEN}Swap Information:{Colors.RESET}
-  Total:     {swap.total / (1024**3):8.1f} GB
-  Used:      {swap.used / (1024**3):8.1f} GB ({swap.percent:5.1f}%)
-  Free:      {swap.free / (1024**3):8.1f} GB"""
+  Total:     {swap_total / (1024**3):8.1f} GB
+  Used:      {swap_used / (1024**3):8.1f} GB ({swap_percent:5.1f}%)
+  Free:      {swap_free / (1024**3):8.1f} GB"""
 
             if disk_available:
                 output += f"""
@@ -127,7 +317,7 @@ class SystemCommands:
 {Colors.GREEN}System Information:{Colors.RESET}
   Boot time:     {boot_time.strftime('%Y-%m-%d %H:%M:%S')}
   Uptime:        {str(uptime).split('.')[0]}
-  Processes:     {len(psutil.pids())}
+  Processes:     {process_count}
 """
             
             return output
@@ -137,9 +327,6 @@ class SystemCommands:
     
     def cmd_kill(self, args: List[str]) -> str:
         """Terminate process by PID"""
-        if not self.psutil_available:
-            return f"{Colors.RED}psutil not available. Install with: pip install psutil{Colors.RESET}"
-        
         if not args:
             return f"{Colors.YELLOW}Usage: kill <pid>{Colors.RESET}"
         
@@ -173,12 +360,12 @@ class SystemCommands:
 {Colors.YELLOW}{'='*50}{Colors.RESET}
 
 {Colors.GREEN}Operating System:{Colors.RESET}
-  OS:           {platform.system()}
-  Release:      {platform.release()}
-  Version:      {platform.version()}
-  Architecture: {platform.machine()}
+  OS:           {_UNAME.system}
+  Release:      {_UNAME.release}
+  Version:      {_UNAME.version}
+  Architecture: {_UNAME.machine}
   Processor:    {platform.processor() or 'Unknown'}
-  Hostname:     {platform.node()}
+  Hostname:     {_UNAME.node}
 
 {Colors.GREEN}Python Environment:{Colors.RESET}
   Version:      {sys.version.split()[0]}
@@ -188,11 +375,13 @@ class SystemCommands:
             
             if self.psutil_available:
                 # Additional system details with psutil
+                cpu_freq = self._cached('cpu_freq', 10.0, psutil.cpu_freq)
+                memory = self._cached('vmem', 1.0, psutil.virtual_memory)
                 cpu_info = f"""
 {Colors.GREEN}Hardware Information:{Colors.RESET}
-  CPU Cores:    {psutil.cpu_count(logical=False)} physical, {psutil.cpu_count()} logical
-  CPU Freq:     {psutil.cpu_freq().current:.1f} MHz (max: {psutil.cpu_freq().max:.1f} MHz)
-  Memory:       {psutil.virtual_memory().total / (1024**3):.1f} GB
+  CPU Cores:    {self._cpu_count} physical, {self._cpu_count_logical} logical
+  CPU Freq:     {cpu_freq.current:.1f} MHz (max: {cpu_freq.max:.1f} MHz)
+  Memory:       {memory.total / (1024**3):.1f} GB
 """
                 system_info += cpu_info
                 
@@ -215,17 +404,16 @@ class SystemCommands:
     
     def cmd_df(self, args: List[str]) -> str:
         """Show disk space usage"""
-        if not self.psutil_available:
-            return f"{Colors.RED}psutil not available. Install with: pip install psutil{Colors.RESET}"
-        
         try:
-            partitions = psutil.disk_partitions()
+            # Physical devices only (all=False); cached since mounts rarely change
+            partitions = self._cached('disk_partitions', 30.0, lambda: psutil.disk_partitions(all=False))
             
-            output = f"{Colors.CYAN}Disk Usage:{Colors.RESET}\n"
-            output += f"{'Filesystem':20} {'Size':>10} {'Used':>10} {'Avail':>10} {'Use%':>5} {'Mounted on':15}\n"
-            output += f"{'-'*75}\n"
+            lines = [_DF_HEADER]
             
             for partition in partitions:
+                if partition.fstype in _PSEUDO_FSTYPES:
+                    continue
+                
                 try:
                     usage = psutil.disk_usage(partition.mountpoint)
                     
@@ -236,64 +424,47 @@ class SystemCommands:
                     
                     filesystem = partition.device[:19] if len(partition.device) > 19 else partition.device
                     
-                    output += (f"{filesystem:20} {size_gb:8.1f}G {used_gb:8.1f}G "
-                              f"{free_gb:8.1f}G {percent:4.0f}% {partition.mountpoint:15}\n")
+                    lines.append(f"{filesystem:20} {size_gb:8.1f}G {used_gb:8.1f}G "
+                                 f"{free_gb:8.1f}G {percent:4.0f}% {partition.mountpoint:15}")
                               
                 except PermissionError:
                     continue
                 except Exception:
                     continue
             
-            return output
+            return '\n'.join(lines) + '\n'
             
         except Exception as e:
             return f"{Colors.RED}Error retrieving disk usage: {str(e)}{Colors.RESET}"
     
     def cmd_free(self, args: List[str]) -> str:
         """Show memory usage"""
-        if not self.psutil_available:
-            return f"{Colors.RED}psutil not available. Install with: pip install psutil{Colors.RESET}"
-        
         try:
-            memory = psutil.virtual_memory()
-            swap = psutil.swap_memory()
-            
-            # Convert to human readable format
-            def format_bytes(bytes_val):
-                for unit in ['B', 'K', 'M', 'G']:
-                    if bytes_val < 1024.0:
-                        return f"{bytes_val:7.1f}{unit}"
-                    bytes_val /= 1024.0
-                return f"{bytes_val:7.1f}T"
-            
-            output = f"{Colors.CYAN}Memory Usage:{Colors.RESET}\n"
-            output += f"{'':14} {'Total':>8} {'Used':>8} {'Free':>8} {'Available':>10} {'Buff/Cache':>11}\n"
-            output += f"{'-'*65}\n"
+            # Same figures as top, so both report the same "used"
+            snap = self._memory_snapshot()
             
             # Calculate buffer/cache (approximation)
-            buffers_cache = memory.total - memory.available - memory.free
+            buffers_cache = snap['mem_total'] - snap['mem_avail'] - snap['mem_free']
             
-            output += (f"{'Mem:':14} {format_bytes(memory.total):>8} "
-                      f"{format_bytes(memory.used):>8} {format_bytes(memory.free):>8} "
-                      f"{format_bytes(memory.available):>10} {format_bytes(buffers_cache):>11}\n")
+            lines = [
+                _FREE_HEADER,
+                (f"{'Mem:':14} {_format_bytes(snap['mem_total']):>8} "
+                 f"{_format_bytes(snap['mem_used']):>8} {_format_bytes(snap['mem_free']):>8} "
+                 f"{_format_bytes(snap['mem_avail']):>10} {_format_bytes(buffers_cache):>11}"),
+                (f"{'Swap:':14} {_format_bytes(snap['swap_total']):>8} "
+                 f"{_format_bytes(snap['swap_used']):>8} {_format_bytes(snap['swap_free']):>8} "
+                 f"{'':>10} {'':>11}")
+            ]
             
-            output += (f"{'Swap:':14} {format_bytes(swap.total):>8} "
-                      f"{format_bytes(swap.used):>8} {format_bytes(swap.free):>8} "
-                      f"{'':>10} {'':>11}\n")
-            
-            return output
+            return '\n'.join(lines) + '\n'
             
         except Exception as e:
             return f"{Colors.RED}Error retrieving memory information: {str(e)}{Colors.RESET}"
     
     def cmd_uptime(self, args: List[str]) -> str:
         """Show system uptime"""
-        if not self.psutil_available:
-            # Fallback without psutil
-            return f"{Colors.YELLOW}System uptime information requires psutil{Colors.RESET}"
-        
         try:
-            boot_time = datetime.fromtimestamp(psutil.boot_time())
+            boot_time = self._boot_time
             uptime = datetime.now() - boot_time
             
             # Format uptime
@@ -346,12 +517,11 @@ class SystemCommands:
             else:
                 return f"{Colors.RED}Environment variable not found: {var_name}{Colors.RESET}"
         else:
-            # Show all environment variables
-            env_vars = []
-            for key, value in sorted(os.environ.items()):
-                # Truncate very long values
-                if len(value) > 100:
-                    value = value[:97] + "..."
-                env_vars.append(f"{Colors.GREEN}{key}{Colors.RESET}={value}")
-            
-            return '\n'.join(env_vars)
\ No newline at end of file
+            # Show all environment variables, truncating very long values.
+            # Not cached: telling whether any value changed costs about as much
+            # as formatting the listing again
+            green, reset = Colors.GREEN, Colors.RESET
+            return '\n'.join(
+                f"{green}{key}{reset}={value if len(value) <= 100 else value[:97] + '...'}"
+                for key, value in sorted(os.environ.items())
+            )
\ No newline at end of file
@@ -3,151 +3,198 @@ Virtual File System - Safe sandbox for file operations
 """
 
 import os
-from typing import Dict, List, Optional
+import time
+import fnmatch
+import re
+from functools import lru_cache
+from bisect import bisect
+from typing import Dict, Iterator, List, Optional
 from pathlib import Path
 import json
 
+_EPOCH = '2024-01-01 00:00:00'
+_DIR_PERMS = 'drwxr-xr-x'
+_FILE_PERMS = '-rw-r--r--'
+
+# Initial sandbox contents as (path, permissions, content, size), parents first;
+# directories have no content
+_DEFAULT_TREE = (
+    ('/', _DIR_PERMS, None, 0),
+    ('/home', _DIR_PERMS, None, 0),
+    ('/home/user', _DIR_PERMS, None, 0),
+    ('/home/user/documents', _DIR_PERMS, None, 0),
+    ('/home/user/documents/readme.txt', _FILE_PERMS,
+     'Welcome to the virtual file system!\nThis is a safe environment for testing commands.', 89),
+    ('/home/user/downloads', _DIR_PERMS, None, 0),
+    ('/home/user/projects', _DIR_PERMS, None, 0),
+    ('/home/user/projects/script.py', '-rwxr-xr-x',
+     '#!/usr/bin/env python3\nprint("Hello, Virtual World!")\n', 46),
+    ('/tmp', 'drwxrwxrwx', None, 0),
+    ('/etc', _DIR_PERMS, None, 0),
+    ('/etc/hosts', _FILE_PERMS, '127.0.0.1 localhost\n::1 localhost\n', 26),
+)
+
+def _child_key(name: str, node: Dict) -> str:
+    """Sort key that keeps directory children in listing order
+    
+    Names compare case-insensitively, and directories include the trailing
+    slash that list_directory shows. Equal keys stay in insertion order.
+    """
+    if node.get('type') == 'directory':
+        return f"{name}/".lower()
+    return name.lower()
+
+@lru_cache(maxsize=256)
+def _glob_matcher(pattern: str, ignore_case: bool):
+    """Compiled match function for a glob, shared across find calls"""
+    return re.compile(fnmatch.translate(pattern), re.IGNORECASE if ignore_case else 0).match
+
+@lru_cache(maxsize=4096)
+def _normalize(current_path: str, path: str) -> str:
+    """Resolve path against current_path; pure, so results are memoized"""
+    if not path.startswith('/'):
+        # Relative path
+        path = os.path.join(current_path, path)
+    
+    # Normalize path
+    parts = []
+    for part in path.split('/'):
+        if part == '' or part == '.':
+            continue
+        elif part == '..':
+            if parts and parts[-1] != '..':
+                parts.pop()
+        else:
+            parts.append(part)
+    
+    result = '/' + '/'.join(parts)
+    return result if result != '/' or len(parts) == 0 else result.rstrip('/')
+
+def _detailed_key(item: Dict) -> str:
+    """Sort key for directories in get_detailed_listing"""
+    return item['name'].lower()
+
+def _join(parent_path: str, name: str) -> str:
+    """Join a normalized directory path and a child name"""
+    return f"/{name}" if parent_path == '/' else f"{parent_path}/{name}"
+
 class VirtualFileSystem:
-    """Simulates a file system for safe operations"""
+    """Simulates a file system for safe operations
+    
+    Nodes are stored flat: _nodes maps every normalized absolute path to its
+    metadata dict, and _children maps each directory path to an ordered
+    {name: node} dict of its entries, kept in listing order.
+    """
     
     def __init__(self):
-        self.virtual_fs = {
-            '/': {
-                'type': 'directory',
-                'created': '2024-01-01 00:00:00',
-                'modified': '2024-01-01 00:00:00',
-                'permissions': 'drwxr-xr-x',
-                'children': {
-                    'home': {
-                        'type': 'directory',
-                        'created': '2024-01-01 00:00:00',
-                        'modified': '2024-01-01 00:00:00',
-                        'permissions': 'drwxr-xr-x',
-                        'children': {
-                            'user': {
-                                'type': 'directory',
-                                'created': '2024-01-01 00:00:00',
-                                'modified': '2024-01-01 00:00:00',
-                                'permissions': 'drwxr-xr-x',
-                                'children': {
-                                    'documents': {
-                                        'type': 'directory',
-                                        'created': '2024-01-01 00:00:00',
-                                        'modified': '2024-01-01 00:00:00',
-                                        'permissions': 'drwxr-xr-x',
-                                        'children': {
-                                            'readme.txt': {
-                                                'type': 'file',
-                                                'content': 'Welcome to the virtual file system!\nThis is a safe environment for testing commands.',
-                                                'created': '2024-01-01 00:00:00',
-                                                'modified': '2024-01-01 00:00:00',
-                                                'permissions': '-rw-r--r--',
-                                                'size': 89
-                                            }
-                                        }
-                                    },
-                                    'downloads': {
-                                        'type': 'directory',
-                                        'created': '2024-01-01 00:00:00',
-                                        'modified': '2024-01-01 00:00:00',
-                                        'permissions': 'drwxr-xr-x',
-                                        'children': {}
-                                    },
-                                    'projects': {
-                                        'type': 'directory',
-                                        'created': '2024-01-01 00:00:00',
-                                        'modified': '2024-01-01 00:00:00',
-                                        'permissions': 'drwxr-xr-x',
-                                        'children': {
-                                            'script.py': {
-                                                'type': 'file',
-                                                'content': '#!/usr/bin/env python3\nprint("Hello, Virtual World!")\n',
-                                                'created': '2024-01-01 00:00:00',
-                                                'modified': '2024-01-01 00:00:00',
-                                                'permissions': '-rwxr-xr-x',
-                                                'size': 46
-                                            }
-                                        }
-                                    }
-                                }
-                            }
-                        }
-                    },
-                    'tmp': {
-                        'type': 'directory',
-                        'created': '2024-01-01 00:00:00',
-                        'modified': '2024-01-01 00:00:00',
-                        'permissions': 'drwxrwxrwx',
-                        'children': {}
-                    },
-                    'etc': {
-                        'type': 'directory',
-                        'created': '2024-01-01 00:00:00',
-                        'modified': '2024-01-01 00:00:00',
-                        'permissions': 'drwxr-xr-x',
-                        'children': {
-                            'hosts': {
-                                'type': 'file',
-                                'content': '127.0.0.1 localhost\n::1 localhost\n',
-                                'created': '2024-01-01 00:00:00',
-                                'modified': '2024-01-01 00:00:00',
-                                'permissions': '-rw-r--r--',
-                                'size': 26
-                            }
-                        }
-                    }
-                }
-            }
-        }
         self.current_path = '/home/user'
-    
-    def normalize_path(self, path: str) -> str:
-        """Normalize a path by resolving . and .. components"""
-        if not path.startswith('/'):
-            # Relative path
-            path = os.path.join(self.current_path, path)
+        # Bumped on every change to the tree or the current path
+        self.version = 0
         
-        # Normalize path
-        parts = []
-        for part in path.split('/'):
-            if part == '' or part == '.':
-                continue
-            elif part == '..':
-                if parts and parts[-1] != '..':
-                    parts.pop()
-            else:
-                parts.append(part)
+        self._nodes: Dict[str, Dict] = {}
+        self._children: Dict[str, Dict[str, Dict]] = {}
+        for path, permissions, content, size in _DEFAULT_TREE:
+            self._add_node(path, permissions, content, size)
         
-        result = '/' + '/'.join(parts)
-        return result if result != '/' or len(parts) == 0 else result.rstrip('/')
+        # Last formatted timestamp and the whole second it was taken in
+        self._last_ts_tick = None
+        self._last_ts_str = ''
     
-    def get_node(self, path: str) -> Optional[Dict]:
-        """Get node at given path"""
-        path = self.normalize_path(path)
+    def _now_str(self) -> str:
+        """Current local time as stored on nodes, formatted at most once per second"""
+        tick = int(time.time())
+        if tick != self._last_ts_tick:
+            self._last_ts_str = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(tick))
+            self._last_ts_tick = tick
+        return self._last_ts_str
+    
+    def _add_node(self, path: str, permissions: str, content: Optional[str], size: int):
+        """Add one entry of the default tree; content is None for directories"""
+        node = {
+            'type': 'directory' if content is None else 'file',
+            'created': _EPOCH,
+            'modified': _EPOCH,
+            'permissions': permissions
+        }
+        if content is not None:
+            node['content'] = content
+            node['size'] = size
         
         if path == '/':
-            return self.virtual_fs['/']
-        
-        parts = path.strip('/').split('/')
-        current = self.virtual_fs['/']
+            self._nodes[path] = node
+            self._children[path] = {}
+        else:
+            parent_path, _, name = path.rpartition('/')
+            self._insert_child(parent_path or '/', name, node)
+    
+    def _walk(self, path: str) -> Iterator[str]:
+        """Yield path and every path below it, parents before children"""
+        pending = [path]
+        while pending:
+            current = pending.pop()
+            yield current
+            children = self._children.get(current)
+            if children:
+                pending.extend(_join(current, name) for name in reversed(children))
+    
+    def _insert_child(self, parent_path: str, name: str, node: Dict):
+        """Add or replace a child while keeping the children sorted"""
+        self.version += 1
+        children = self._children[parent_path]
+        path = _join(parent_path, name)
+        key = _child_key(name, node)
+        if name in children:
+            # Replacing an entry drops whatever lived below it
+            self._drop(path)
+            if _child_key(name, children[name]) != key:
+                # A file replacing a directory (or the reverse) sorts elsewhere
+                del children[name]
+        self._nodes[path] = node
+        if node.get('type') == 'directory':
+            self._children.setdefault(path, {})
         
-        for part in parts:
-            if (current and current.get('type') == 'directory' and 
-                part in current.get('children', {})):
-                current = current['children'][part]
-            else:
-                return None
+        if name in children or not children or key >= _child_key(*next(reversed(children.items()))):
+            children[name] = node
+            return
         
-        return current
+        # Rebuild in place so existing references to the dict stay valid
+        items = list(children.items())
+        index = bisect([_child_key(child_name, child) for child_name, child in items], key)
+        items.insert(index, (name, node))
+        children.clear()
+        children.update(items)
+    
+    def _drop(self, path: str):
+        """Remove path and its descendants from the flat tables"""
+        for sub_path in list(self._walk(path)):
+            self._nodes.pop(sub_path, None)
+            self._children.pop(sub_path, None)
+    
+    def _detach(self, path: str):
+        """Unlink path from its parent and drop its subtree"""
+        self.version += 1
+        parent_path, _, name = path.rpartition('/')
+        del self._children[parent_path or '/'][name]
+        self._drop(path)
+    
+    def normalize_path(self, path: str) -> str:
+        """Normalize a path by resolving . and .. components"""
+        return _normalize(self.current_path, path)
+    
+    def get_node(self, path: str) -> Optional[Dict]:
+        """Get node at given path"""
+        return self._nodes.get(self.normalize_path(path))
+    
+    def _resolve(self, path: str) -> tuple[str, str, str, Optional[Dict]]:
+        """Normalize path once and return (path, parent_path, name, existing_node)"""
+        path = self.normalize_path(path)
+        parent_path, _, name = path.rpartition('/')
+        return path, parent_path or '/', name, self._nodes.get(path)
     
     def get_parent_node(self, path: str) -> tuple[Optional[Dict], str]:
         """Get parent node and item name"""
-        path = self.normalize_path(path)
-        parent_path = os.path.dirname(path)
-        item_name = os.path.basename(path)
-        
-        parent = self.get_node(parent_path)
-        return parent, item_name
+        _, parent_path, item_name, _ = self._resolve(path)
+        return self._nodes.get(parent_path), item_name
     
     def exists(self, path: str) -> bool:
         """Check if path exists"""
@@ -165,53 +212,64 @@ class VirtualFileSystem:
     
     def create_directory(self, path: str) -> bool:
         """Create a new directory"""
-        path = self.normalize_path(path)
-        parent, dir_name = self.get_parent_node(path)
+        path, parent_path, dir_name, existing = self._resolve(path)
         
-        if parent and parent.get('type') == 'directory':
-            if dir_name not in parent.get('children', {}):
-                import datetime
-                now = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                parent.setdefault('children', {})[dir_name] = {
+        if dir_name and parent_path in self._children:
+            if existing is None:
+                now = self._now_str()
+                self._insert_child(parent_path, dir_name, {
                     'type': 'directory',
                     'created': now,
                     'modified': now,
-                    'permissions': 'drwxr-xr-x',
-                    'children': {}
-                }
+                    'permissions': 'drwxr-xr-x'
+                })
                 return True
         return False
     
+    def create_directories(self, paths: List[str]) -> List[tuple[str, bool]]:
+        """Create several directories, returning (path, created) pairs in order"""
+        return [(path, self.create_directory(path)) for path in paths]
+    
     def create_file(self, path: str, content: str = '') -> bool:
         """Create a new file"""
-        path = self.normalize_path(path)
-        parent, file_name = self.get_parent_node(path)
-        
-        if parent and parent.get('type') == 'directory':
-            import datetime
-            now = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            parent.setdefault('children', {})[file_name] = {
+        _, parent_path, file_name, _ = self._resolve(path)
+        return self._put_file(parent_path, file_name, content)
+    
+    def _put_file(self, parent_path: str, file_name: str, content: str) -> bool:
+        """Create or replace a file entry in an existing directory"""
+        if file_name and parent_path in self._children:
+            now = self._now_str()
+            self._insert_child(parent_path, file_name, {
                 'type': 'file',
                 'content': content,
                 'created': now,
                 'modified': now,
                 'permissions': '-rw-r--r--',
                 'size': len(content)
-            }
+            })
             return True
         return False
     
     def write_file(self, path: str, content: str) -> bool:
         """Write content to existing or new file"""
-        node = self.get_node(path)
+        _, parent_path, file_name, node = self._resolve(path)
         if node and node.get('type') == 'file':
-            import datetime
             node['content'] = content
-            node['modified'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            node['modified'] = self._now_str()
             node['size'] = len(content)
+            self.version += 1
             return True
         else:
-            return self.create_file(path, content)
+            return self._put_file(parent_path, file_name, content)
+    
+    def touch_file(self, path: str) -> bool:
+        """Update the modified time of an existing file"""
+        node = self.get_node(path)
+        if node and node.get('type') == 'file':
+            node['modified'] = self._now_str()
+            self.version += 1
+            return True
+        return False
     
     def read_file(self, path: str) -> Optional[str]:
         """Read file content"""
@@ -222,83 +280,129 @@ class VirtualFileSystem:
     
     def remove_item(self, path: str) -> bool:
         """Remove file or directory"""
-        path = self.normalize_path(path)
-        parent, item_name = self.get_parent_node(path)
+        path, _, _, node = self._resolve(path)
         
-        if parent and parent.get('type') == 'directory':
-            if item_name in parent.get('children', {}):
-                del parent['children'][item_name]
-                return True
+        if path != '/' and node is not None:
+            self._detach(path)
+            return True
         return False
     
+    def remove_many(self, paths: List[str], recursive: bool = False,
+                    force: bool = False) -> List[tuple[str, str]]:
+        """Remove several items, resolving each path with a single lookup
+        
+        Returns (path, status) pairs where status is 'removed', 'not_found',
+        'is_directory' (a directory without recursive) or 'failed'. Missing
+        items are left out entirely when force is set.
+        """
+        results = []
+        for path in paths:
+            full_path = self.normalize_path(path)
+            node = self._nodes.get(full_path)
+            
+            if node is None:
+                if not force:
+                    results.append((path, 'not_found'))
+            elif node.get('type') == 'directory' and not recursive:
+                results.append((path, 'is_directory'))
+            elif full_path == '/':
+                # The root has no parent to unlink it from
+                results.append((path, 'failed'))
+            else:
+                self._detach(full_path)
+                results.append((path, 'removed'))
+        return results
+    
     def move_item(self, src_path: str, dst_path: str) -> bool:
         """Move/rename item"""
-        src_path = self.normalize_path(src_path)
-        dst_path = self.normalize_path(dst_path)
-        
-        src_parent, src_name = self.get_parent_node(src_path)
-        dst_parent, dst_name = self.get_parent_node(dst_path)
+        src_path, _, _, item = self._resolve(src_path)
+        dst_path, dst_parent_path, dst_name, _ = self._resolve(dst_path)
         
-        if (src_parent and src_parent.get('type') == 'directory' and
-            dst_parent and dst_parent.get('type') == 'directory' and
-            src_name in src_parent.get('children', {})):
+        if (src_path != '/' and item is not None and
+            dst_name and dst_parent_path in self._children):
+            
+            if dst_path == src_path:
+                return True
+            if dst_path.startswith(src_path + '/'):
+                # A directory cannot be moved inside itself
+                return False
             
-            # Move the item
-            item = src_parent['children'][src_name]
-            dst_parent.setdefault('children', {})[dst_name] = item
-            del src_parent['children'][src_name]
+            # Re-key the subtree under its new path
+            moved = [(sub_path, self._nodes[sub_path], self._children.get(sub_path))
+                     for sub_path in self._walk(src_path)]
+            self._detach(src_path)
+            self._insert_child(dst_parent_path, dst_name, item)
+            for sub_path, node, children in moved:
+                new_path = dst_path + sub_path[len(src_path):]
+                self._nodes[new_path] = node
+                if children is not None:
+                    self._children[new_path] = children
             
             # Update modified time
-            import datetime
-            item['modified'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            item['modified'] = self._now_str()
             return True
         
         return False
     
     def copy_item(self, src_path: str, dst_path: str) -> bool:
         """Copy item"""
-        import copy
+        src_path, _, _, src_node = self._resolve(src_path)
+        dst_path, dst_parent_path, dst_name, _ = self._resolve(dst_path)
         
-        src_path = self.normalize_path(src_path)
-        dst_path = self.normalize_path(dst_path)
-        
-        src_node = self.get_node(src_path)
-        dst_parent, dst_name = self.get_parent_node(dst_path)
-        
-        if (src_node and dst_parent and dst_parent.get('type') == 'directory'):
-            # Deep copy the source item
-            item_copy = copy.deepcopy(src_node)
+        if (src_node is not None and dst_name and dst_parent_path in self._children):
+            # Copy the source subtree before touching the destination, keyed by
+            # each node's path relative to the source. Nodes are flat dicts of
+            # immutable values, so a shallow copy is a full copy.
+            prefix_len = len(src_path) if src_path != '/' else 0
+            copied = [(sub_path[prefix_len:] if sub_path != src_path else '',
+                       dict(self._nodes[sub_path]),
+                       list(self._children.get(sub_path, ())))
+                      for sub_path in self._walk(src_path)]
             
             # Update timestamps
-            import datetime
-            now = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            now = self._now_str()
+            item_copy = copied[0][1]
             item_copy['created'] = now
             item_copy['modified'] = now
             
-            dst_parent.setdefault('children', {})[dst_name] = item_copy
+            self._insert_child(dst_parent_path, dst_name, item_copy)
+            nodes = {suffix: node for suffix, node, _ in copied}
+            for suffix, node, child_names in copied:
+                new_path = dst_path + suffix
+                self._nodes[new_path] = node
+                if node.get('type') == 'directory':
+                    # Source children are already in listing order
+                    self._children[new_path] = {name: nodes[f"{suffix}/{name}"] for name in child_names}
             return True
         
         return False
     
     def list_directory(self, path: str) -> List[str]:
         """List directory contents"""
-        node = self.get_node(path)
-        if node and node.get('type') == 'directory':
-            items = []
-            for name, item in node.get('children', {}).items():
+        children = self._children.get(self.normalize_path(path))
+        if children is not None:
+            # Children are already in name order; files come before directories
+            files = []
+            dirs = []
+            for name, item in children.items():
                 if item.get('type') == 'directory':
-                    items.append(f"{name}/")
+                    dirs.append(f"{name}/")
                 else:
-                    items.append(name)
-            return sorted(items, key=lambda x: (x.endswith('/'), x.lower()))
+                    files.append(name)
+            return files + dirs
         return []
     
     def get_detailed_listing(self, path: str) -> List[Dict]:
         """Get detailed directory listing with file info"""
-        node = self.get_node(path)
-        if node and node.get('type') == 'directory':
-            items = []
-            for name, item in node.get('children', {}).items():
+        children = self._children.get(self.normalize_path(path))
+        if children is not None:
+            # Children are already in name order; directories come first.
+            # Directories are stored in slash-suffixed order; this listing
+            # compares bare names, and a stable sort of nearly sorted input is linear
+            dirs = []
+            files = []
+            for name, item in children.items():
+                items = dirs if item.get('type') == 'directory' else files
                 items.append({
                     'name': name,
                     'type': item.get('type'),
@@ -307,34 +411,29 @@ class VirtualFileSystem:
                     'modified': item.get('modified', 'unknown'),
                     'is_directory': item.get('type') == 'directory'
                 })
-            return sorted(items, key=lambda x: (not x['is_directory'], x['name'].lower()))
+            dirs.sort(key=_detailed_key)
+            return dirs + files
         return []
     
-    def find_files(self, pattern: str, search_path: str = None) -> List[str]:
+    def find_files(self, pattern: str, search_path: str = None, ignore_case: bool = False) -> List[str]:
         """Find files matching pattern"""
-        import fnmatch
-        
         if search_path is None:
             search_path = self.current_path
         
         matches = []
+        # Translate the glob once instead of lowering both names per child
+        match = _glob_matcher(pattern, ignore_case)
         
-        def search_recursive(node_path: str, node: Dict):
-            if node.get('type') == 'directory':
-                for child_name, child_node in node.get('children', {}).items():
-                    child_path = f"{node_path}/{child_name}".replace('//', '/')
-                    
-                    # Check if filename matches pattern
-                    if fnmatch.fnmatch(child_name.lower(), pattern.lower()):
-                        matches.append(child_path)
-                    
-                    # Recurse into subdirectories
-                    if child_node.get('type') == 'directory':
-                        search_recursive(child_path, child_node)
-        
-        start_node = self.get_node(search_path)
-        if start_node:
-            search_recursive(search_path, start_node)
+        # Walk the directory tables in listing order; results keep the caller's prefix
+        start_path = self.normalize_path(search_path)
+        if start_path in self._children:
+            prefix_len = len(start_path)
+            walk = self._walk(start_path)
+            next(walk)
+            for path in walk:
+                if match(path.rpartition('/')[2]):
+                    relative = path[prefix_len:].lstrip('/')
+                    matches.append(f"{search_path}/{relative}".replace('//', '/'))
         
         return matches
     
@@ -346,25 +445,43 @@ class VirtualFileSystem:
         target_path = self.normalize_path(path)
         
         if self.is_directory(target_path):
-            self.current_path = target_path
+            if target_path != self.current_path:
+                self.current_path = target_path
+                self.version += 1
             return True
         return False
     
+    def export_state(self) -> Dict:
+        """Export the node table, directory listings and current path as plain data"""
+        return {
+            'nodes': self._nodes,
+            'children': {path: list(children) for path, children in self._children.items()},
+            'current_path': self.current_path
+        }
+    
+    def load_state(self, state: Dict):
+        """Restore nodes, directory listings and current path from exported data"""
+        nodes = state['nodes']
+        self._nodes = nodes
+        self._children = {
+            path: {name: nodes[_join(path, name)] for name in names}
+            for path, names in state['children'].items()
+        }
+        self.current_path = state['current_path']
+        self.version += 1
+    
     def get_stats(self) -> Dict:
         """Get filesystem statistics"""
-        def count_items(node: Dict) -> tuple[int, int, int]:
-            """Count files, directories, and total size"""
-            files = 0
-            dirs = 0
-            size = 0
-            
+        files = 0
+        dirs = 0
+        size = 0
+        
+        # Every node is in the flat table, so a single pass counts the whole tree
+        for node in self._nodes.values():
             if node.get('type') == 'file':
-                files = 1
-                size = node.get('size', 0)
+                files += 1
+                size += node.get('size', 0)
             elif node.get('type') == 'directory':
-                dirs = 1
-                for child in node.get('children', {}).values():
-                    child_files, child_dirs, child_size = count_items(child)
-                    files += child_files
-                    dirs += child_dirs
-                    size += child_size
\ No newline at end of file
+                dirs += 1
+        
+        return {'files': files, 'dirs': dirs, 'size': size}
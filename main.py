@@ -6,17 +6,17 @@ A fully functional terminal with Python backend
 
 import sys
 import os
+import importlib.util
 from pathlib import Path
 
 # Add the current directory to Python path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from terminal_core import Terminal
 from utils.colors import Colors
+from utils.output import write_stdout
 
-def print_banner():
-    """Print the terminal banner"""
-    banner = f"""
+# The banner never changes once Colors is configured; build it at import
+_BANNER = f"""
 {Colors.CYAN}╔══════════════════════════════════════════════════════════╗
 ║          AI-POWERED PYTHON TERMINAL v2.0                ║
 ║                                                          ║
@@ -25,23 +25,30 @@ def print_banner():
 ║  {Colors.GREEN}Type 'exit' to quit{Colors.CYAN}                                    ║
 ╚══════════════════════════════════════════════════════════╝{Colors.RESET}
     """
-    print(banner)
+
+def print_banner():
+    """Print the terminal banner"""
+    write_stdout(_BANNER + '\n')
 
 def install_requirements():
     """Install required packages if not present"""
     required_packages = ['psutil']
     
-    try:
-        import psutil
-    except ImportError:
+    # Locate packages without importing them; the terminal loads them when needed
+    missing = [package for package in required_packages
+               if package not in sys.modules and importlib.util.find_spec(package) is None]
+    
+    if missing:
         print(f"{Colors.YELLOW}Installing required packages...{Colors.RESET}")
         import subprocess
-        for package in required_packages:
+        for package in missing:
             try:
                 subprocess.run([sys.executable, "-m", "pip", "install", package], 
                              check=True, capture_output=True)
             except subprocess.CalledProcessError:
                 print(f"{Colors.RED}Failed to install {package}. Some features may not work.{Colors.RESET}")
+        # Let the later terminal import see the freshly installed packages
+        importlib.invalidate_caches()
         print(f"{Colors.GREEN}Installation complete!{Colors.RESET}")
 
 def main():
@@ -72,6 +79,9 @@ def main():
             """)
             return
     
+    # Imported here so --help doesn't load the command modules and psutil
+    from terminal_core import Terminal
+    
     print_banner()
     
     # Initialize terminal
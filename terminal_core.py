@@ -6,8 +6,14 @@ import os
 import sys
 import readline
 import atexit
+import bisect
+import subprocess
+from collections import deque
+from functools import partial
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List
+from types import MappingProxyType
+from typing import List
 
 from commands.file_operations import FileOperations
 from commands.system_commands import SystemCommands
@@ -15,6 +21,129 @@ from commands.ai_commands import AICommands
 from filesystem.virtual_fs import VirtualFileSystem
 from utils.colors import Colors
 from utils.command_parser import CommandParser
+from utils.output import write_stdout
+from utils.shell import ShellWorker
+
+# Commands kept in session history and in the readline history file
+HISTORY_LIMIT = 1000
+
+# New history entries collected before they are appended to the history file
+HISTORY_FLUSH_EVERY = 20
+
+# Readline history entries already in the history file
+_history_saved = {'length': 0}
+
+def _mark_history_saved():
+    """Record that every entry now in readline's history is in the history file"""
+    _history_saved['length'] = readline.get_current_history_length()
+
+def _pending_history() -> int:
+    """Number of readline entries not yet in the history file"""
+    return readline.get_current_history_length() - _history_saved['length']
+
+def _flush_history(path: str):
+    """Append the readline entries added since the last flush to the history file"""
+    count = _pending_history()
+    if count <= 0:
+        return
+    # Let readline write its own file format (libedit adds a header and escapes)
+    try:
+        readline.append_history_file(count, path)
+    except FileNotFoundError:
+        # append_history_file needs an existing file; start one with the whole history
+        try:
+            readline.write_history_file(path)
+        except OSError:
+            pass  # Ignore errors
+    except OSError:
+        pass  # Ignore errors
+    _history_saved['length'] += count
+
+# Command name -> (component attribute, method name); None means the Terminal itself
+COMMAND_TABLE = MappingProxyType({
+    # File operations
+    'ls': ('file_ops', 'cmd_ls'),
+    'cd': ('file_ops', 'cmd_cd'),
+    'pwd': ('file_ops', 'cmd_pwd'),
+    'mkdir': ('file_ops', 'cmd_mkdir'),
+    'rm': ('file_ops', 'cmd_rm'),
+    'rmdir': ('file_ops', 'cmd_rmdir'),
+    'touch': ('file_ops', 'cmd_touch'),
+    'cat': ('file_ops', 'cmd_cat'),
+    'cp': ('file_ops', 'cmd_cp'),
+    'mv': ('file_ops', 'cmd_mv'),
+    'find': ('file_ops', 'cmd_find'),
+    'grep': ('file_ops', 'cmd_grep'),
+    
+    # System commands
+    'ps': ('system_commands', 'cmd_ps'),
+    'top': ('system_commands', 'cmd_top'),
+    'kill': ('system_commands', 'cmd_kill'),
+    'sysinfo': ('system_commands', 'cmd_sysinfo'),
+    'df': ('system_commands', 'cmd_df'),
+    'free': ('system_commands', 'cmd_free'),
+    'uptime': ('system_commands', 'cmd_uptime'),
+    'whoami': ('system_commands', 'cmd_whoami'),
+    'date': ('system_commands', 'cmd_date'),
+    'env': ('system_commands', 'cmd_env'),
+    
+    # AI and utility commands
+    'ai': ('ai_commands', 'cmd_ai'),
+    'echo': (None, '_cmd_echo'),
+    'clear': (None, '_cmd_clear'),
+    'cls': (None, '_cmd_clear'),  # Windows alias
+    'help': (None, '_cmd_help'),
+    'history': (None, '_cmd_history'),
+    'exit': (None, '_cmd_exit'),
+    'quit': (None, '_cmd_exit'),  # Alias
+})
+
+# Frozen name list for tab completion
+COMMAND_NAMES = tuple(COMMAND_TABLE)
+
+# Help depends only on Colors, which is fixed at import
+_HELP_TEXT = f"""
+{Colors.CYAN}Available Commands:{Colors.RESET}
+
+{Colors.YELLOW}File Operations:{Colors.RESET}
+  ls [path]           - List directory contents
+  cd <dir>            - Change directory
+  pwd                 - Print working directory
+  mkdir <dir>         - Create directory
+  rmdir <dir>         - Remove empty directory
+  rm <file/dir>       - Remove file or directory
+  touch <file>        - Create empty file
+  cat <file>          - Display file contents
+  cp <src> <dst>      - Copy file or directory
+  mv <src> <dst>      - Move/rename file or directory
+  find [-i] <name>    - Find files by name (-i ignores case)
+  grep <pattern> <file> - Search for pattern in file
+
+{Colors.YELLOW}System Commands:{Colors.RESET}
+  ps                  - Show running processes
+  top                 - Show system resource usage
+  kill <pid>          - Terminate process by PID
+  sysinfo             - Show system information
+  df                  - Show disk space usage
+  free                - Show memory usage
+  uptime              - Show system uptime
+  whoami              - Show current user
+  date                - Show current date/time
+  env                 - Show environment variables
+
+{Colors.YELLOW}AI & Utility:{Colors.RESET}
+  ai <query>          - Natural language command interpretation
+  echo <text>         - Display text
+  clear/cls           - Clear terminal screen
+  history             - Show command history
+  help                - Show this help
+  exit/quit           - Exit terminal
+
+{Colors.YELLOW}Examples:{Colors.RESET}
+  {Colors.GREEN}ai create a folder called projects{Colors.RESET}
+  {Colors.GREEN}ai show me what files are here{Colors.RESET}
+  {Colors.GREEN}ai copy file1.txt to backup folder{Colors.RESET}
+        """
 
 class Terminal:
     """Main terminal class that orchestrates all components"""
@@ -27,112 +156,117 @@ class Terminal:
         self.virtual_fs = VirtualFileSystem() if use_virtual else None
         self.command_parser = CommandParser()
         
+        # Bind the filesystem-specific lookups once instead of testing use_virtual per call
+        if use_virtual:
+            self.get_current_directory = partial(getattr, self.virtual_fs, 'current_path')
+            self._matches_for = self._virtual_matches
+        else:
+            self.get_current_directory = os.getcwd
+            self._matches_for = self._listing_matches
+        
         # Initialize command handlers
         self.file_ops = FileOperations(self.virtual_fs)
         self.system_commands = SystemCommands()
         self.ai_commands = AICommands(self)
         
-        # Command history
-        self.command_history = []
+        # Unknown commands go to one persistent shell rather than a new one each time
+        self.shell = None
+        if not use_virtual and os.name != 'nt':
+            self.shell = ShellWorker()
+            atexit.register(self.shell.close)
+        
+        # User and host don't change during a session; fix the prompt around the path
+        username = os.getenv('USER', os.getenv('USERNAME', 'user'))
+        hostname = 'terminal'
+        self._prompt_head = f"{Colors.GREEN}{username}@{hostname}{Colors.RESET}:{Colors.BLUE}"
+        self._prompt_tail = f"{Colors.RESET}$ "
+        
+        # Command history, bounded so long sessions don't grow without limit
+        self.command_history = deque(maxlen=HISTORY_LIMIT)
         self.history_file = Path.home() / '.python_terminal_history'
         
         # Setup readline for better CLI experience
         self.setup_readline()
         
-        # Register all available commands
-        self.commands = self._register_commands()
-    
-    def _register_commands(self) -> Dict:
-        """Register all available commands"""
-        commands = {}
-        
-        # File operations
-        commands.update({
-            'ls': self.file_ops.cmd_ls,
-            'cd': self.file_ops.cmd_cd,
-            'pwd': self.file_ops.cmd_pwd,
-            'mkdir': self.file_ops.cmd_mkdir,
-            'rm': self.file_ops.cmd_rm,
-            'rmdir': self.file_ops.cmd_rmdir,
-            'touch': self.file_ops.cmd_touch,
-            'cat': self.file_ops.cmd_cat,
-            'cp': self.file_ops.cmd_cp,
-            'mv': self.file_ops.cmd_mv,
-            'find': self.file_ops.cmd_find,
-            'grep': self.file_ops.cmd_grep,
-        })
-        
-        # System commands
-        commands.update({
-            'ps': self.system_commands.cmd_ps,
-            'top': self.system_commands.cmd_top,
-            'kill': self.system_commands.cmd_kill,
-            'sysinfo': self.system_commands.cmd_sysinfo,
-            'df': self.system_commands.cmd_df,
-            'free': self.system_commands.cmd_free,
-            'uptime': self.system_commands.cmd_uptime,
-            'whoami': self.system_commands.cmd_whoami,
-            'date': self.system_commands.cmd_date,
-            'env': self.system_commands.cmd_env,
-        })
-        
-        # AI and utility commands
-        commands.update({
-            'ai': self.ai_commands.cmd_ai,
-            'echo': self._cmd_echo,
-            'clear': self._cmd_clear,
-            'cls': self._cmd_clear,  # Windows alias
-            'help': self._cmd_help,
-            'history': self._cmd_history,
-            'exit': self._cmd_exit,
-            'quit': self._cmd_exit,  # Alias
-        })
-        
-        return commands
+        # All available commands; handlers are resolved on this instance at dispatch
+        self._completion_options = []
+        self._completion_listing = None
+        self.commands = COMMAND_TABLE
     
     def setup_readline(self):
         """Setup readline for command history and auto-completion"""
         readline.set_completer(self.completer)
         readline.parse_and_bind('tab: complete')
-        readline.set_history_length(1000)
+        readline.set_history_length(HISTORY_LIMIT)
         
-        # Load existing history
+        # Load existing history; new lines are appended as they are entered
         self.load_history()
-        
-        # Save history on exit
-        atexit.register(self.save_history)
     
     def completer(self, text, state):
         """Auto-completion function"""
+        # Readline asks for candidates one state at a time; build the list on
+        # state 0 and serve the rest of this Tab press from it
+        if state == 0:
+            self._completion_options = self._completion_candidates(text)
+        options = self._completion_options
+        
+        if state < len(options):
+            return options[state]
+        return None
+    
+    def _completion_candidates(self, text) -> List[str]:
+        """Collect completion candidates for the current line buffer"""
         options = []
+        line_buffer = readline.get_line_buffer().strip()
         
         # Command completion
-        if not text or ' ' not in readline.get_line_buffer().strip():
-            options = [cmd for cmd in self.commands.keys() if cmd.startswith(text)]
+        if not text or ' ' not in line_buffer:
+            options = [cmd for cmd in COMMAND_NAMES if cmd.startswith(text)]
         else:
             # File/directory completion for file commands
             try:
-                line_buffer = readline.get_line_buffer().strip()
                 parts = line_buffer.split()
                 if len(parts) >= 2:
                     cmd = parts[0]
                     if cmd in ['cd', 'ls', 'cat', 'rm', 'cp', 'mv']:
-                        # Get current directory listing for completion
-                        current_dir = self.get_current_directory()
-                        if self.use_virtual:
-                            items = self.virtual_fs.list_directory(current_dir)
-                        else:
-                            try:
-                                items = os.listdir(current_dir)
-                            except:
-                                items = []
-                        options = [item for item in items if item.startswith(text)]
+                        # Complete from the current directory listing
+                        options = self._matches_for(self.get_current_directory(), text)
             except:
                 pass
         
-        if state < len(options):
-            return options[state]
-        return None
+        return options
+    
+    def _virtual_matches(self, path: str, text: str) -> List[str]:
+        """Virtual entry names starting with text, in listing order"""
+        return [name for name in self.virtual_fs.list_directory(path) if name.startswith(text)]
+    
+    def _listing_matches(self, path: str, text: str) -> List[str]:
+        """Real entry names starting with text"""
+        names = self._sorted_listing(path)
+        # Matches form one contiguous run in the sorted names
+        start = bisect.bisect_left(names, text)
+        end = start
+        while end < len(names) and names[end].startswith(text):
+            end += 1
+        return names[start:end]
+    
+    def _sorted_listing(self, path: str) -> List[str]:
+        """Sorted entry names of a real directory, reused until its mtime changes"""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return []
+        cached = self._completion_listing
+        if cached is not None and cached[0] == path and cached[1] == mtime:
+            return cached[2]
+        
+        try:
+            with os.scandir(path) as it:
+                names = sorted(entry.name for entry in it)
+        except OSError:
+            names = []
+        self._completion_listing = (path, mtime, names)
+        return names
     
     def load_history(self):
         """Load command history from file"""
@@ -141,36 +275,21 @@ class Terminal:
                 readline.read_history_file(str(self.history_file))
         except:
             pass  # Ignore errors
-    
-    def save_history(self):
-        """Save command history to file"""
-        try:
-            readline.write_history_file(str(self.history_file))
-        except:
-            pass  # Ignore errors
-    
-    def get_current_directory(self) -> str:
-        """Get current working directory"""
-        if self.use_virtual:
-            return self.virtual_fs.current_path
-        else:
-            return os.getcwd()
+        _mark_history_saved()
     
     def get_prompt(self) -> str:
         """Generate the command prompt"""
         current_dir = self.get_current_directory()
-        username = os.getenv('USER', os.getenv('USERNAME', 'user'))
-        hostname = 'terminal'
         
         # Shorten path for display
         if len(current_dir) > 30:
             current_dir = '...' + current_dir[-27:]
         
-        return f"{Colors.GREEN}{username}@{hostname}{Colors.RESET}:{Colors.BLUE}{current_dir}{Colors.RESET}$ "
+        return f"{self._prompt_head}{current_dir}{self._prompt_tail}"
     
     def execute(self, command_line: str) -> str:
         """Execute a command and return output"""
-        if not command_line.strip():
+        if not command_line or command_line.isspace():
             return ""
         
         # Parse command
@@ -183,9 +302,12 @@ class Terminal:
         self.command_history.append(command_line)
         
         # Execute command
-        if cmd in self.commands:
+        entry = COMMAND_TABLE.get(cmd)
+        if entry is not None:
+            owner, method = entry
             try:
-                result = self.commands[cmd](args)
+                handler = getattr(self if owner is None else getattr(self, owner), method)
+                result = handler(args)
                 return result if result else ""
             except Exception as e:
                 return f"{Colors.RED}Error executing {cmd}: {str(e)}{Colors.RESET}"
@@ -193,13 +315,16 @@ class Terminal:
             # Try to execute as system command (if not in virtual mode)
             if not self.use_virtual:
                 try:
-                    import subprocess
-                    result = subprocess.run(command_line, shell=True, capture_output=True, 
-                                          text=True, timeout=10)
-                    if result.returncode == 0:
-                        return result.stdout.strip()
+                    if self.shell is not None:
+                        returncode, stdout, stderr = self.shell.run(command_line, os.getcwd(), timeout=10)
+                    else:
+                        result = subprocess.run(command_line, shell=True, capture_output=True, 
+                                              text=True, timeout=10)
+                        returncode, stdout, stderr = result.returncode, result.stdout, result.stderr
+                    if returncode == 0:
+                        return stdout.strip()
                     else:
-                        return f"{Colors.RED}Command failed: {result.stderr.strip()}{Colors.RESET}"
+                        return f"{Colors.RED}Command failed: {stderr.strip()}{Colors.RESET}"
                 except subprocess.TimeoutExpired:
                     return f"{Colors.RED}Command timed out{Colors.RESET}"
                 except Exception as e:
@@ -209,18 +334,25 @@ class Terminal:
     
     def run(self):
         """Main terminal loop"""
+        history_path = str(self.history_file)
+        # Whatever has not been appended yet is written on the way out
+        atexit.register(_flush_history, history_path)
         while self.running:
             try:
                 # Get user input
                 prompt = self.get_prompt()
                 command_line = input(prompt)
+                # input() has already added the line to readline's history;
+                # append to the file once per batch rather than per command
+                if _pending_history() >= HISTORY_FLUSH_EVERY:
+                    _flush_history(history_path)
                 
                 # Execute command
                 output = self.execute(command_line)
                 
                 # Print output if any
                 if output:
-                    print(output)
+                    write_stdout(output + '\n')
                     
             except KeyboardInterrupt:
                 print(f"\n{Colors.YELLOW}Use 'exit' to quit{Colors.RESET}")
@@ -239,49 +371,7 @@ class Terminal:
     
     def _cmd_help(self, args: List[str]) -> str:
         """Show help information"""
-        help_text = f"""
-{Colors.CYAN}Available Commands:{Colors.RESET}
-
-{Colors.YELLOW}File Operations:{Colors.RESET}
-  ls [path]           - List directory contents
-  cd <dir>            - Change directory
-  pwd                 - Print working directory
-  mkdir <dir>         - Create directory
-  rmdir <dir>         - Remove empty directory
-  rm <file/dir>       - Remove file or directory
-  touch <file>        - Create empty file
-  cat <file>          - Display file contents
-  cp <src> <dst>      - Copy file or directory
-  mv <src> <dst>      - Move/rename file or directory
-  find <name>         - Find files by name
-  grep <pattern> <file> - Search for pattern in file
-
-{Colors.YELLOW}System Commands:{Colors.RESET}
-  ps                  - Show running processes
-  top                 - Show system resource usage
-  kill <pid>          - Terminate process by PID
-  sysinfo             - Show system information
-  df                  - Show disk space usage
-  free                - Show memory usage
-  uptime              - Show system uptime
-  whoami              - Show current user
-  date                - Show current date/time
-  env                 - Show environment variables
-
-{Colors.YELLOW}AI & Utility:{Colors.RESET}
-  ai <query>          - Natural language command interpretation
-  echo <text>         - Display text
-  clear/cls           - Clear terminal screen
-  history             - Show command history
-  help                - Show this help
-  exit/quit           - Exit terminal
-
-{Colors.YELLOW}Examples:{Colors.RESET}
-  {Colors.GREEN}ai create a folder called projects{Colors.RESET}
-  {Colors.GREEN}ai show me what files are here{Colors.RESET}
-  {Colors.GREEN}ai copy file1.txt to backup folder{Colors.RESET}
-        """
-        return help_text
+        return _HELP_TEXT
     
     def _cmd_history(self, args: List[str]) -> str:
         """Show command history"""
@@ -290,12 +380,10 @@ class Terminal:
         
         # Show last 20 commands
         start_idx = max(0, len(self.command_history) - 20)
-        history_lines = []
-        
-        for i, cmd in enumerate(self.command_history[start_idx:], start_idx + 1):
-            history_lines.append(f"{Colors.CYAN}{i:4d}{Colors.RESET}  {cmd}")
-        
-        return "\n".join(history_lines)
+        return "\n".join(
+            f"{Colors.CYAN}{i:4d}{Colors.RESET}  {cmd}"
+            for i, cmd in enumerate(islice(self.command_history, start_idx, None), start_idx + 1)
+        )
     
     def _cmd_exit(self, args: List[str]) -> str:
         """Exit terminal"""
@@ -0,0 +1,57 @@
+"""
+Tests for natural language command interpretation
+"""
+
+import unittest
+
+from commands import ai_commands
+from commands.ai_commands import AICommandInterpreter
+
+MULTILINE_QUERIES = [
+    "show\nfiles",
+    "copy x\nto y",
+    "what\nis here",
+    "foo\nls",
+    "please\ncreate folder called docs",
+    "move a.txt\ninto b",
+    "list files\n",
+]
+
+class FusedPatternTest(unittest.TestCase):
+    """The fused alternation must agree with the per-pattern loop"""
+    
+    def test_multiline_queries_match_sequential_loop(self):
+        for query in MULTILINE_QUERIES:
+            with self.subTest(query=query):
+                expected = None
+                for index, (_, pattern) in enumerate(ai_commands._PATTERN_SEQUENCE):
+                    match = pattern.search(query)
+                    if match:
+                        expected = (index, match.groups())
+                        break
+                
+                fused = ai_commands._COMBINED_PATTERN.search(query)
+                actual = None
+                if fused:
+                    index, _, group_names = ai_commands._ALTERNATIVE_INFO[fused.lastgroup]
+                    actual = (index, tuple(fused.group(name) for name in group_names))
+                
+                self.assertEqual(actual, expected)
+    
+    def test_newline_does_not_join_pattern_parts(self):
+        interpreter = AICommandInterpreter()
+        self.assertEqual(interpreter.interpret("show\nfiles"), [])
+        self.assertEqual(interpreter.interpret("copy x\nto y"), [])
+
+class InterpretCacheTest(unittest.TestCase):
+    """Compiled patterns and cached interpretations are shared across sessions"""
+    
+    def test_cache_is_shared_between_interpreters(self):
+        ai_commands._interpret_cached.cache_clear()
+        AICommandInterpreter().interpret("list files")
+        AICommandInterpreter().interpret("list files")
+        info = ai_commands._interpret_cached.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Tests for file operation commands
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from commands import file_operations
+from commands.file_operations import FileOperations
+
+class GrepThresholdTest(unittest.TestCase):
+    """grep output must not depend on which side of the mmap threshold a file is"""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.ops = FileOperations()
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+    
+    def _write(self, name: str, data: bytes) -> str:
+        path = os.path.join(self.tmpdir, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+    
+    def _grep_both_ways(self, path: str, pattern: str):
+        small = self.ops.cmd_grep([pattern, path])
+        with mock.patch.object(file_operations, 'GREP_MMAP_THRESHOLD', 0):
+            large = self.ops.cmd_grep([pattern, path])
+        return small, large
+    
+    def test_crlf_file(self):
+        path = self._write('crlf.txt', b'alpha\r\nbeta match\r\ngamma\rmatch again\r\n')
+        small, large = self._grep_both_ways(path, 'match')
+        self.assertEqual(small, large)
+        self.assertIn('2:', small)
+        self.assertIn('4:', small)
+    
+    def test_non_utf8_file(self):
+        path = self._write('latin1.txt', b'one match\ncaf\xe9 match\nthree\n')
+        small, large = self._grep_both_ways(path, 'match')
+        self.assertEqual(small, large)
+    
+    def test_ascii_file_uses_mapped_path(self):
+        path = self._write('plain.txt', b'first\nsecond MATCH  \nthird\nmatch')
+        with mock.patch.object(FileOperations, '_grep_mapped', wraps=self.ops._grep_mapped) as mapped:
+            small, large = self._grep_both_ways(path, 'match')
+        self.assertEqual(small, large)
+        self.assertEqual(mapped.call_count, 1)
+    
+    def test_lone_carriage_return_before_match(self):
+        path = self._write('cr.txt', b'one\rtwo\nthree\nmatch\n')
+        small, large = self._grep_both_ways(path, 'match')
+        self.assertEqual(small, large)
+        self.assertIn('4:', small)
+    
+    def test_non_ascii_case_folds(self):
+        # The str regex matches KELVIN SIGN for k and LONG S for s
+        path = self._write('folds.txt', 'caf\u00e9\n\u212aey\nba\u017f\nplain\n'.encode('utf-8'))
+        for pattern in ('key', 'bas', 'caf'):
+            small, large = self._grep_both_ways(path, pattern)
+            self.assertEqual(small, large)
+            self.assertNotIn('Pattern not found', small)
+
+class CatThresholdTest(unittest.TestCase):
+    """cat output must not depend on which side of the mmap threshold a file is"""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.ops = FileOperations()
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+    
+    def _cat_both_ways(self, data: bytes):
+        path = os.path.join(self.tmpdir, 'file.txt')
+        with open(path, 'wb') as f:
+            f.write(data)
+        small = self.ops.cmd_cat([path])
+        with mock.patch.object(file_operations, 'CAT_MMAP_THRESHOLD', 0):
+            large = self.ops.cmd_cat([path])
+        return small, large
+    
+    def test_newlines_and_utf8(self):
+        data = 'caf\u00e9\r\nline\rlast\n'.encode('utf-8') * 20000
+        small, large = self._cat_both_ways(data)
+        self.assertEqual(small, large)
+        self.assertNotIn('\r', large)
+    
+    def test_binary_file(self):
+        small, large = self._cat_both_ways(b'text\n\xff\xfe\n')
+        self.assertEqual(small, large)
+        self.assertIn('Binary file', large)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+"""
+Tests for system information commands
+"""
+
+import subprocess
+import sys
+import time
+import unittest
+from unittest import mock
+
+from commands import system_commands
+from commands.system_commands import PSUTIL_AVAILABLE, SystemCommands
+
+@unittest.skipUnless(PSUTIL_AVAILABLE, "psutil not installed")
+class PsCpuPercentTest(unittest.TestCase):
+    """ps must report CPU usage measured since its previous call"""
+    
+    def setUp(self):
+        self.busy = subprocess.Popen([sys.executable, '-c', 'while True: pass'])
+        self.addCleanup(self.busy.wait)
+        self.addCleanup(self.busy.kill)
+    
+    def _cpu_of_busy(self, output: str) -> float:
+        for line in output.splitlines()[1:]:
+            fields = line.split()
+            if fields and fields[0] == str(self.busy.pid):
+                return float(fields[-3].rstrip('%'))
+        self.fail(f"PID {self.busy.pid} missing from ps output:\n{output}")
+    
+    def test_second_run_reports_busy_process(self):
+        commands = SystemCommands()
+        only_busy = lambda *args: [self.busy.pid]
+        with mock.patch.object(system_commands, '_fast_pids_linux', only_busy), \
+             mock.patch.object(system_commands.psutil, 'pids', only_busy):
+            commands.cmd_ps([])
+            time.sleep(0.5)
+            output = commands.cmd_ps([])
+        self.assertGreater(self._cpu_of_busy(output), 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
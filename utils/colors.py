@@ -2,6 +2,13 @@
 Color utilities for terminal output
 """
 
+import os
+import re
+import sys
+
+# ANSI escape sequences, compiled once for strip_colors
+_ANSI_RE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
 class Colors:
     """ANSI color codes for terminal output"""
     
@@ -44,9 +51,7 @@ class Colors:
     @staticmethod
     def strip_colors(text: str) -> str:
         """Remove ANSI color codes from text"""
-        import re
-        ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-        return ansi_escape.sub('', text)
+        return _ANSI_RE.sub('', text)
     
     @staticmethod
     def colorize(text: str, color: str) -> str:
@@ -76,4 +81,17 @@ class Colors:
     @staticmethod
     def highlight(text: str) -> str:
         """Highlight text"""
-        return f"{Colors.BOLD}{Colors.YELLOW}{text}{Colors.RESET}"
\ No newline at end of file
+        return f"{Colors.BOLD}{Colors.YELLOW}{text}{Colors.RESET}"
+
+def _colors_enabled() -> bool:
+    """Check whether output should carry ANSI color codes"""
+    if os.environ.get('NO_COLOR'):
+        return False
+    stdout = sys.stdout
+    return stdout is not None and hasattr(stdout, 'isatty') and stdout.isatty()
+
+# Pipes, logs and the web API gain nothing from escape codes; blank them once at import
+if not _colors_enabled():
+    for _name in list(vars(Colors)):
+        if _name.isupper():
+            setattr(Colors, _name, '')
@@ -2,8 +2,90 @@
 Command line parser utilities
 """
 
+import fnmatch
+import glob
+import os
+import re
 import shlex
-from typing import Tuple, List
+from dataclasses import dataclass
+from typing import FrozenSet, Tuple, List
+
+@dataclass(frozen=True)
+class ParsedCmd:
+    """Command arguments split into positionals and option flags"""
+    positional: List[str]
+    flags: FrozenSet[str]
+    short_flags: FrozenSet[str]
+    
+    def has(self, short: str, long: str = None) -> bool:
+        """Check for a short option letter or its long form"""
+        return short in self.short_flags or (long is not None and long in self.flags)
+
+def parse_args(args: List[str]) -> ParsedCmd:
+    """
+    Split arguments into positionals and flags in a single pass
+    
+    Short option clusters such as -la contribute each letter to short_flags;
+    every option token is also kept as-is in flags.
+    
+    Args:
+        args: Arguments following the command name
+        
+    Returns:
+        ParsedCmd with set-based flag lookups
+    """
+    positional = []
+    flags = set()
+    short_flags = set()
+    for arg in args:
+        if arg[:1] != '-':
+            positional.append(arg)
+            continue
+        flags.add(arg)
+        if arg[1:2] != '-':
+            short_flags.update(arg[1:])
+    return ParsedCmd(positional, frozenset(flags), frozenset(short_flags))
+
+# $VAR and ${VAR} references
+_VAR_RE = re.compile(r'\$\{([^}]+)\}|\$([A-Za-z_][A-Za-z0-9_]*)')
+
+def _split_pipes(command_line: str) -> List[str]:
+    """Split a command line on pipes that are outside quotes and not escaped"""
+    if '"' not in command_line and "'" not in command_line and '\\' not in command_line:
+        return command_line.split('|')
+    
+    parts = []
+    start = 0
+    quote = None
+    i = 0
+    while i < len(command_line):
+        char = command_line[i]
+        if quote is not None:
+            if char == quote:
+                quote = None
+            elif char == '\\' and quote == '"':
+                i += 1
+        elif char == '"' or char == "'":
+            quote = char
+        elif char == '\\':
+            i += 1
+        elif char == '|':
+            parts.append(command_line[start:i])
+            start = i + 1
+        i += 1
+    parts.append(command_line[start:])
+    return parts
+
+# Redirection operators given as their own token
+_REDIR_EXACT = {'>': 'stdout', '>>': 'stdout_append', '2>': 'stderr', '<': 'stdin'}
+
+# Operators attached to a filename, longest first so >> is not read as >
+_REDIR_PREFIX = (
+    ('>>', 'stdout_append', 2),
+    ('2>', 'stderr', 2),
+    ('>', 'stdout', 1),
+    ('<', 'stdin', 1),
+)
 
 class CommandParser:
     """Parse command lines with proper handling of quotes and escapes"""
@@ -24,12 +106,17 @@ class CommandParser:
         Raises:
             ValueError: If command line cannot be parsed
         """
-        if not command_line.strip():
-            return "", []
+        # Without quotes or escapes shlex would only split on whitespace
+        if '"' not in command_line and "'" not in command_line and '\\' not in command_line:
+            parts = command_line.split()
+            if not parts:
+                return "", []
+            return parts[0], parts[1:]
         
         try:
-            # Use shlex to properly handle quotes and escapes
-            parts = shlex.split(command_line.strip())
+            # Use shlex to properly handle quotes and escapes; it skips
+            # surrounding whitespace itself
+            parts = shlex.split(command_line)
             
             if not parts:
                 return "", []
@@ -57,8 +144,8 @@ class CommandParser:
             cmd, args = self.parse(command_line)
             return [(cmd, args)]
         
-        # Split by pipes and parse each part
-        pipe_parts = command_line.split('|')
+        # Split by unquoted pipes and parse each part
+        pipe_parts = _split_pipes(command_line)
         commands = []
         
         for part in pipe_parts:
@@ -86,15 +173,29 @@ class CommandParser:
         Returns:
             List of arguments with globs expanded
         """
-        import glob
-        import os
-        
         expanded_args = []
+        # Directory listings shared by every pattern in this call
+        listings = {}
         
         for arg in args:
             if '*' in arg or '?' in arg or '[' in arg:
                 # Expand glob pattern
-                matches = glob.glob(arg)
+                dirname, basename = os.path.split(arg)
+                if glob.has_magic(dirname) or '**' in arg:
+                    matches = glob.glob(arg)
+                else:
+                    names = listings.get(dirname)
+                    if names is None:
+                        try:
+                            with os.scandir(dirname or '.') as it:
+                                names = [entry.name for entry in it]
+                        except OSError:
+                            names = []
+                        listings[dirname] = names
+                    # Like glob, only dot-patterns match hidden entries
+                    if basename[:1] != '.':
+                        names = [name for name in names if name[:1] != '.']
+                    matches = [os.path.join(dirname, name) for name in fnmatch.filter(names, basename)]
                 if matches:
                     # Sort matches for consistent output
                     expanded_args.extend(sorted(matches))
@@ -117,25 +218,24 @@ class CommandParser:
         Returns:
             Command line with variables substituted
         """
-        import os
-        import re
+        if '$' not in command_line:
+            return command_line
         
-        if variables is None:
-            variables = {}
+        if not variables:
+            # Environment only; return the original text if a name is not set
+            return _VAR_RE.sub(
+                lambda match: os.environ.get(match.group(1) or match.group(2), match.group(0)),
+                command_line
+            )
         
-        # Substitute $VAR and ${VAR} patterns
+        # Check custom variables first, then environment
         def replace_var(match):
             var_name = match.group(1) or match.group(2)
-            
-            # Check custom variables first, then environment
             if var_name in variables:
                 return str(variables[var_name])
-            else:
-                return os.getenv(var_name, match.group(0))  # Return original if not found
+            return os.environ.get(var_name, match.group(0))
         
-        # Pattern for $VAR or ${VAR}
-        pattern = r'\$\{([^}]+)\}|\$([A-Za-z_][A-Za-z0-9_]*)'
-        return re.sub(pattern, replace_var, command_line)
+        return _VAR_RE.sub(replace_var, command_line)
     
     def parse_redirections(self, args: List[str]) -> Tuple[List[str], dict]:
         """
@@ -154,57 +254,25 @@ class CommandParser:
         while i < len(args):
             arg = args[i]
             
-            if arg == '>':
-                # Redirect stdout
+            target = _REDIR_EXACT.get(arg)
+            if target is not None:
+                # Operator and filename as separate tokens: > file
                 if i + 1 < len(args):
-                    redirections['stdout'] = args[i + 1]
+                    redirections[target] = args[i + 1]
                     i += 2
                 else:
                     clean_args.append(arg)
                     i += 1
-            elif arg == '>>':
-                # Append stdout
-                if i + 1 < len(args):
-                    redirections['stdout_append'] = args[i + 1]
-                    i += 2
-                else:
-                    clean_args.append(arg)
-                    i += 1
-            elif arg == '2>':
-                # Redirect stderr
-                if i + 1 < len(args):
-                    redirections['stderr'] = args[i + 1]
-                    i += 2
-                else:
-                    clean_args.append(arg)
-                    i += 1
-            elif arg == '<':
-                # Redirect stdin
-                if i + 1 < len(args):
-                    redirections['stdin'] = args[i + 1]
-                    i += 2
-                else:
-                    clean_args.append(arg)
-                    i += 1
-            elif arg.startswith('>'):
-                # Handle >file format
-                redirections['stdout'] = arg[1:]
-                i += 1
-            elif arg.startswith('>>'):
-                # Handle >>file format
-                redirections['stdout_append'] = arg[2:]
-                i += 1
-            elif arg.startswith('2>'):
-                # Handle 2>file format
-                redirections['stderr'] = arg[2:]
-                i += 1
-            elif arg.startswith('<'):
-                # Handle <file format
-                redirections['stdin'] = arg[1:]
-                i += 1
+                continue
+            
+            # Operator attached to the filename: >file
+            for prefix, target, length in _REDIR_PREFIX:
+                if arg.startswith(prefix):
+                    redirections[target] = arg[length:]
+                    break
             else:
                 clean_args.append(arg)
-                i += 1
+            i += 1
         
         return clean_args, redirections
     
@@ -235,27 +303,23 @@ class CommandParser:
         Returns:
             List of (command, operator) tuples
         """
-        import re
-        
-        # Split on && or ||, keeping the operators
-        parts = re.split(r'(\s*&&\s*|\s*\|\|\s*)', command_line)
-        
         commands = []
-        i = 0
-        while i < len(parts):
-            cmd = parts[i].strip()
+        start = 0
+        while True:
+            and_idx = command_line.find('&&', start)
+            or_idx = command_line.find('||', start)
+            if and_idx < 0 and or_idx < 0:
+                cmd = command_line[start:].strip()
+                if cmd:
+                    commands.append((cmd, None))
+                return commands
+            
+            # Whichever operator comes first ends this command
+            if and_idx < 0 or (0 <= or_idx < and_idx):
+                idx = or_idx
+            else:
+                idx = and_idx
+            cmd = command_line[start:idx].strip()
             if cmd:
-                operator = None
-                if i + 1 < len(parts):
-                    next_part = parts[i + 1].strip()
-                    if next_part in ['&&', '||']:
-                        operator = next_part
-                        i += 2
-                    else:
-                        i += 1
-                else:
-                    i += 1
-                
-                commands.append((cmd, operator))
-        
-        return commands
\ No newline at end of file
+                commands.append((cmd, command_line[idx:idx + 2]))
+            start = idx + 2
\ No newline at end of file
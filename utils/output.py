@@ -0,0 +1,31 @@
+"""
+Output helpers for writing straight to the terminal
+"""
+
+import os
+import sys
+
+def write_stdout(text: str):
+    """
+    Write text to stdout with as few write(2) calls as possible
+
+    Falls back to the stream's own write when stdout has no usable file
+    descriptor (for example when it has been replaced for capture).
+
+    Args:
+        text: Text to write, including any trailing newline
+    """
+    stream = sys.stdout
+    try:
+        fd = stream.fileno()
+    except (AttributeError, OSError, ValueError):
+        stream.write(text)
+        stream.flush()
+        return
+
+    # Keep ordering with anything already buffered through print()
+    stream.flush()
+    view = memoryview(text.encode(stream.encoding or 'utf-8', errors='replace'))
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
@@ -0,0 +1,119 @@
+"""
+Persistent shell worker for running system commands
+"""
+
+import os
+import secrets
+import selectors
+import shlex
+import signal
+import subprocess
+import time
+from typing import Tuple
+
+class ShellWorker:
+    """Run command lines through one long-lived /bin/sh instead of a new shell per command"""
+
+    def __init__(self, shell: str = '/bin/sh'):
+        self.shell = shell
+        self._proc = None
+        # Random marker so command output cannot fake the end of a result
+        self._marker = f"__END_{secrets.token_hex(8)}__"
+        self._out_marker = f"\n{self._marker} ".encode()
+        self._err_marker = f"\n{self._marker}\n".encode()
+
+    def _spawn(self):
+        """Start the shell in its own process group so a hung command can be killed with it"""
+        self._proc = subprocess.Popen(
+            [self.shell], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE, bufsize=0, start_new_session=True
+        )
+
+    def close(self):
+        """Stop the shell and anything still running under it"""
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        if proc.poll() is None:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        proc.wait()
+        for pipe in (proc.stdin, proc.stdout, proc.stderr):
+            pipe.close()
+
+    def run(self, command_line: str, cwd: str, timeout: float) -> Tuple[int, str, str]:
+        """
+        Run a command line in cwd and collect its output
+
+        Each command runs in a subshell with stdin from /dev/null, so it sees
+        a fresh working directory and cannot change the worker's state or
+        consume the commands that follow it.
+
+        Args:
+            command_line: Shell command line to run
+            cwd: Directory to run the command in
+            timeout: Seconds to wait before killing the command
+
+        Returns:
+            Tuple of (returncode, stdout, stderr)
+
+        Raises:
+            subprocess.TimeoutExpired: If the command runs past the timeout
+        """
+        if self._proc is None or self._proc.poll() is not None:
+            self._spawn()
+        proc = self._proc
+
+        script = (
+            f"cd {shlex.quote(cwd)} && (eval {shlex.quote(command_line)}) </dev/null\n"
+            f"printf '\\n%s %d\\n' {self._marker} $?; printf '\\n%s\\n' {self._marker} >&2\n"
+        )
+        try:
+            proc.stdin.write(script.encode())
+        except OSError:
+            # The shell went away between commands; start over on the next call
+            self.close()
+            raise
+
+        out = bytearray()
+        err = bytearray()
+        buffers = {proc.stdout.fileno(): out, proc.stderr.fileno(): err}
+        deadline = time.monotonic() + timeout
+        returncode = None
+
+        with selectors.DefaultSelector() as selector:
+            for fd in buffers:
+                selector.register(fd, selectors.EVENT_READ)
+
+            while buffers:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.close()
+                    raise subprocess.TimeoutExpired(command_line, timeout)
+
+                for key, _ in selector.select(remaining):
+                    buf = buffers[key.fd]
+                    chunk = os.read(key.fd, 65536)
+                    if not chunk:
+                        # The shell itself exited; report what it printed
+                        self.close()
+                        return proc.returncode, out.decode(errors='replace'), err.decode(errors='replace')
+                    buf += chunk
+
+                    if buf is out:
+                        index = out.rfind(self._out_marker)
+                        if index < 0 or not out.endswith(b'\n'):
+                            continue
+                        returncode = int(out[index + len(self._out_marker):-1])
+                        del out[index:]
+                    else:
+                        if not err.endswith(self._err_marker):
+                            continue
+                        del err[-len(self._err_marker):]
+
+                    selector.unregister(key.fd)
+                    del buffers[key.fd]
+
+        return returncode, out.decode(errors='replace'), err.decode(errors='replace')